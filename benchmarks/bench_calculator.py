@@ -0,0 +1,117 @@
+"""
+Benchmark of the per tick position computation during a whole-house move.
+
+Every cover has a travel and a tilt calculator and all of them are moving. The per cover
+model asks each calculator for its position and reached flag, like the covers did on
+every tick. The bank model computes all rows in one vectorized pass and reads the
+results. Without NumPy the bank falls back to a loop over its rows. The memory per
+calculator and the cost of single position queries (as made by commands and the
+schedule) are reported too, for a calculator on its own and one in a bank.
+
+Run from the repository root:  python -m benchmarks.bench_calculator
+"""
+import random
+import time
+import timeit
+import tracemalloc
+
+from custom_components.blinds_controller import calculator
+
+COVERS = 200
+TICKS = 500
+START = 1000.0
+QUERIES = ("current_position", "is_traveling", "position_reached")
+
+
+def build(covers_count, bank, clock):
+    rng = random.Random(1)
+    calcs = []
+    for _ in range(covers_count * 2):
+        calc = calculator.TravelCalculator(
+            rng.uniform(10, 60), rng.uniform(10, 60),
+            bank=bank, clock=clock,
+        )
+        calc.set_position(rng.randint(0, 100))
+        calc.start_travel(rng.choice((0, 100)))
+        calcs.append(calc)
+    return calcs
+
+
+def run_per_cover(covers_count):
+    clock = calculator.ManualClock(START)
+    calcs = build(covers_count, None, clock)
+    started = time.perf_counter()
+    for tick in range(TICKS):
+        clock.now = START + tick * 0.1
+        for calc in calcs:
+            calc.current_position()
+            calc.position_reached()
+    return (time.perf_counter() - started) / TICKS
+
+
+def run_bank(covers_count):
+    bank = calculator.TravelCalculatorBank(clock=calculator.ManualClock(START))
+    calcs = build(covers_count, bank, None)
+    started = time.perf_counter()
+    for tick in range(TICKS):
+        bank.compute(START + tick * 0.1)
+        for calc in calcs:
+            calc.computed_position()
+            calc.computed_reached()
+    return (time.perf_counter() - started) / TICKS
+
+
+def run_bank_compute_only(covers_count):
+    bank = calculator.TravelCalculatorBank(clock=calculator.ManualClock(START))
+    build(covers_count, bank, None)
+    started = time.perf_counter()
+    for tick in range(TICKS):
+        bank.compute(START + tick * 0.1)
+    return (time.perf_counter() - started) / TICKS
+
+
+def memory_per_calculator(covers_count, in_bank):
+    tracemalloc.start()
+    clock = calculator.ManualClock(START)
+    bank = calculator.TravelCalculatorBank(clock=clock) if in_bank else None
+    calcs = build(covers_count, bank, clock)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(calcs)
+
+
+def query_costs(in_bank, number=100000):
+    """Return the seconds per call of each query of a travelling calculator."""
+    clock = calculator.ManualClock(START)
+    bank = calculator.TravelCalculatorBank(clock=clock) if in_bank else None
+    calc = calculator.TravelCalculator(25, 30, bank=bank, clock=clock)
+    calc.set_position(90)
+    calc.start_travel(10)
+    clock.advance(5)
+    return {
+        query: min(timeit.repeat(getattr(calc, query), number=number, repeat=5)) / number
+        for query in QUERIES
+    }
+
+
+def main():
+    print(f"numpy: {'yes' if calculator.np is not None else 'no'}")
+    print(f"bytes per calculator on its own: {memory_per_calculator(COVERS, False):.0f}")
+    print(f"bytes per calculator in a bank of {COVERS} covers: {memory_per_calculator(COVERS, True):.0f}")
+    print(f"\n{'calculator':>10} " + " ".join(f"{query + ' us':>19}" for query in QUERIES))
+    for label, in_bank in (("alone", False), ("in bank", True)):
+        costs = query_costs(in_bank)
+        print(f"{label:>10} " + " ".join(f"{costs[query] * 1e6:>19.2f}" for query in QUERIES))
+    print()
+    print(f"{'covers':>7} {'model':>14} {'us/tick':>10}")
+    for covers_count in (10, COVERS, 1000):
+        for model, run in (
+            ("per cover", run_per_cover),
+            ("bank", run_bank),
+            ("bank compute", run_bank_compute_only),
+        ):
+            print(f"{covers_count:>7} {model:>14} {run(covers_count) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of the state change routing to the covers.
+
+Compares the old model, where every cover listened to all state_changed events on the
+bus, with the shared entity keyed dispatcher. The number of handler calls per event is
+reported for a house with a few thousand unrelated sensors.
+
+Run from the repository root:  python -m benchmarks.bench_dispatcher
+"""
+import asyncio
+import random
+import time
+
+from custom_components.blinds_controller import dispatcher as dispatcher_module
+
+from .fake_hass import FakeHass, fake_track_state_change_event
+
+SENSORS = 3000
+EVENTS = 20000
+
+
+class CoverStub:
+    """Counts the state changes delivered to a cover."""
+
+    calls = 0
+
+    def __init__(self, index):
+        self.entity_up = f"switch.blind_{index}_up"
+        self.entity_down = f"switch.blind_{index}_down"
+
+    async def handle_state_changed(self, event):
+        CoverStub.calls += 1
+
+    def handle_state_changed_bus(self, event):
+        # What the bus listener of the old model did before discarding the event
+        CoverStub.calls += 1
+        if event.data.get("entity_id") not in (self.entity_up, self.entity_down):
+            return
+
+
+async def run(covers_count, routed):
+    hass = FakeHass(asyncio.get_running_loop())
+    covers = [CoverStub(index) for index in range(covers_count)]
+    entity_ids = [f"sensor.sensor_{index}" for index in range(SENSORS)]
+    for cover in covers:
+        entity_ids += [cover.entity_up, cover.entity_down]
+        if routed:
+            dispatcher_module.async_get_dispatcher(hass).async_register(
+                (cover.entity_up, cover.entity_down), cover.handle_state_changed
+            )
+        else:
+            hass.bus.async_listen("state_changed", cover.handle_state_changed_bus)
+    # Let the dispatcher subscribe
+    await asyncio.sleep(0)
+
+    rng = random.Random(1)
+    CoverStub.calls = 0
+    started = time.perf_counter()
+    for _ in range(EVENTS):
+        entity_id = rng.choice(entity_ids)
+        hass.states.async_set(entity_id, str(rng.random()))
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    return CoverStub.calls / EVENTS, elapsed
+
+
+def main():
+    dispatcher_module.async_track_state_change_event = fake_track_state_change_event
+    print(f"{'covers':>7} {'model':>10} {'calls/event':>12} {'seconds':>8}")
+    for covers_count in (10, 100, 1000):
+        for routed in (False, True):
+            calls, elapsed = asyncio.run(run(covers_count, routed))
+            model = "dispatcher" if routed else "bus"
+            print(f"{covers_count:>7} {model:>10} {calls:>12.3f} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark of the move_group service against one cover command per cover.
+
+N covers with tilt (10, 50 and 100 by default) run two scenes on a virtual clock, once
+with move_group and once with the cover services a scene or automation would call:
+
+* scene: every cover moves to a position and then to a tilt position
+* retarget: every cover is sent to a position and tilt, then, while still moving, to
+  another position without a tilt
+
+The script reports the relay service calls made to start the scenes and in total, and
+checks that move_group ends every cover at the position and tilt the cover services
+reach, with at most one call per relay state to start a scene. A tilt of an earlier
+target must not be applied after a retarget. A broken guarantee fails the script
+with a non-zero exit code.
+
+Run from the repository root:  python -m benchmarks.bench_group [--covers 10]
+"""
+import argparse
+import asyncio
+from types import SimpleNamespace
+
+from homeassistant.components.cover import ATTR_CURRENT_POSITION, ATTR_CURRENT_TILT_POSITION
+
+from custom_components.blinds_controller.group import async_handle_move_group
+
+from .fake_hass import VirtualClockLoop
+from .house import House
+
+COVERS = (10, 50, 100)
+MODES = ("cover services", "move_group")
+# Scenes run one after the other: (position, tilt, position of the retarget or None)
+SCENES = {
+    "retarget": (60, 30, 80),
+    "scene": (40, 30, None),
+}
+# Seconds after which the covers are retargeted, well before they arrive
+RETARGET_AFTER = 3
+# Relay service calls starting a scene with move_group, one per relay state
+MAX_START_CALLS = 2
+# The covers do not follow the sun or the weather during the benchmark
+OVERRIDES = {"delay_control": False, "protect_the_blinds": False}
+
+
+async def move_group(house, position, tilt=None):
+    targets = {}
+    for cover in house.covers:
+        target = {"position": position}
+        if tilt is not None:
+            target["tilt_position"] = tilt
+        targets[cover.entity_id] = target
+    await async_handle_move_group(house.hass, SimpleNamespace(data={"targets": targets}))
+
+
+async def cover_services(house, position):
+    await asyncio.gather(*(cover.async_set_cover_position(position=position) for cover in house.covers))
+
+
+async def cover_services_tilt(house, tilt, settle):
+    # A scene sets the tilt once the covers reached their position
+    await asyncio.sleep(settle)
+    await asyncio.gather(*(cover.async_set_cover_tilt_position(tilt_position=tilt) for cover in house.covers))
+
+
+async def scenario(house, mode):
+    """Run the scenes, return the calls and the end positions of every scene."""
+    hass = house.hass
+    settle = house.longest_travel + 2
+    await house.async_setup()
+    # Start from open covers, so both scenes move them down
+    await asyncio.gather(*(cover.async_open_cover() for cover in house.covers))
+    await asyncio.sleep(settle)
+
+    results = {}
+    for name, (position, tilt, retarget) in SCENES.items():
+        calls = len(hass.services.calls)
+        started = house.loop.time()
+        if mode == "move_group":
+            await move_group(house, position, tilt)
+        else:
+            await cover_services(house, position)
+        start_calls = sum(1 for at, _ in hass.services.call_log[calls:] if at == started)
+        if retarget is not None:
+            await asyncio.sleep(RETARGET_AFTER)
+            if mode == "move_group":
+                await move_group(house, retarget)
+            else:
+                # The tilt waited for the position that was never reached
+                await cover_services(house, retarget)
+        elif mode != "move_group":
+            await cover_services_tilt(house, tilt, settle)
+        await asyncio.sleep(settle)
+        results[name] = {
+            "start_calls": start_calls,
+            "calls": len(hass.services.calls) - calls,
+            "positions": {
+                cover.entity_id: (
+                    hass.states.get(cover.entity_id).attributes.get(ATTR_CURRENT_POSITION),
+                    hass.states.get(cover.entity_id).attributes.get(ATTR_CURRENT_TILT_POSITION),
+                )
+                for cover in house.covers
+            },
+        }
+    return results
+
+
+def run(count, mode):
+    loop = VirtualClockLoop()
+    try:
+        house = House(loop, count, tilt_every=1, overrides=OVERRIDES)
+        return loop.run_until_complete(scenario(house, mode))
+    finally:
+        loop.close()
+
+
+def check(count, name, reference, grouped):
+    """Return the guarantees move_group broke in the scene."""
+    problems = []
+    if grouped["start_calls"] > MAX_START_CALLS:
+        problems.append(f"{grouped['start_calls']} calls to start the scene")
+    wrong = [
+        f"{entity_id} at {grouped['positions'][entity_id]} instead of {expected}"
+        for entity_id, expected in reference["positions"].items()
+        if grouped["positions"][entity_id] != expected
+    ]
+    problems.extend(wrong[:3])
+    if len(wrong) > 3:
+        problems.append(f"and {len(wrong) - 3} more covers")
+    return [f"{name} with {count} covers: {problem}" for problem in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--covers", type=int, nargs="+", default=COVERS)
+    args = parser.parse_args()
+
+    print(f"{'covers':>6} {'scene':>9} {'mode':>15} {'start calls':>12} {'calls':>7}")
+    problems = []
+    for count in args.covers:
+        results = {mode: run(count, mode) for mode in MODES}
+        for name in SCENES:
+            for mode in MODES:
+                result = results[mode][name]
+                print(f"{count:>6} {name:>9} {mode:>15} {result['start_calls']:>12} {result['calls']:>7}")
+            problems.extend(check(count, name, results["cover services"][name], results["move_group"][name]))
+    if problems:
+        raise SystemExit("\n".join(["FAILED:", *problems]))
+    print("\nall checks passed")
+
+
+if __name__ == "__main__":
+    main()
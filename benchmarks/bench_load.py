@@ -0,0 +1,209 @@
+"""
+Load simulation of a whole house of blinds on a virtual clock.
+
+N covers (10, 100 and 1000 by default) run the real BlindsCover code against the fake
+hass. The script opens all covers, lets the sunset schedule close them, sends a storm
+through the weather coordinator and closes everything again. For every phase it reports:
+
+* lag: how long single event loop iterations blocked (maximum and 99th percentile)
+* cpu: process time per simulated second
+* calls and writes: relay service calls and state machine writes
+* peak calls/s and gateway queue: most relay commands in one second and the longest
+  backlog of a relay gateway executing GATEWAY_RATE commands per second
+* alloc: peak memory allocated during the phase, from a second run under tracemalloc
+
+The results are saved as JSON, pass an earlier file with --compare to spot regressions.
+
+Run from the repository root:  python -m benchmarks.bench_load [--covers 10 100]
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+import json
+import os
+import time
+import tracemalloc
+
+from custom_components.blinds_controller.scheduler import DEFAULT_SPREAD, async_get_schedule_engine
+
+from .fake_hass import VirtualClockLoop
+from .house import CALM, STORM, House, set_sun
+
+COVERS = (10, 100, 1000)
+RESULTS = os.path.join(os.path.dirname(__file__), "results", "bench_load.json")
+# Metrics compared with --compare, lower is better for all of them
+COMPARED = (
+    "cpu_ms_per_sim_s", "lag_max_ms", "service_calls", "state_writes", "peak_calls_per_s",
+    "gateway_queue", "alloc_peak_kib",
+)
+# Relay commands per second a Zigbee or Modbus gateway gets through
+GATEWAY_RATE = 20
+
+
+def call_peaks(call_log):
+    """Return the most relay commands in one second and the longest gateway backlog."""
+    per_second = {}
+    backlog = 0.0
+    max_backlog = 0.0
+    last = None
+    for at, commands in call_log:
+        per_second[int(at)] = per_second.get(int(at), 0) + commands
+        if last is not None:
+            backlog = max(0.0, backlog - (at - last) * GATEWAY_RATE)
+        backlog += commands
+        max_backlog = max(max_backlog, backlog)
+        last = at
+    return max(per_second.values(), default=0), round(max_backlog)
+
+
+class PhaseRecorder:
+    """Collects the metrics of each phase of a run."""
+
+    def __init__(self, house, allocations):
+        self.house = house
+        self.allocations = allocations
+        self.results = {}
+
+    async def measure(self, name, phase):
+        loop = self.house.loop
+        hass = self.house.hass
+        calls = len(hass.services.calls)
+        logged = len(hass.services.call_log)
+        writes = hass.states.writes
+        virtual_started = loop.time()
+        if self.allocations:
+            tracemalloc.reset_peak()
+            memory_started = tracemalloc.get_traced_memory()[0]
+        loop.iteration_times = []
+        cpu_started = time.process_time()
+        await phase()
+        cpu = time.process_time() - cpu_started
+        lags = sorted(loop.iteration_times)
+        loop.iteration_times = None
+        if self.allocations:
+            self.results[name] = {
+                "alloc_peak_kib": (tracemalloc.get_traced_memory()[1] - memory_started) / 1024
+            }
+            return
+        simulated = loop.time() - virtual_started
+        peak_calls, gateway_queue = call_peaks(hass.services.call_log[logged:])
+        self.results[name] = {
+            "sim_seconds": simulated,
+            "cpu_ms_per_sim_s": cpu * 1000 / simulated,
+            "lag_max_ms": lags[-1] * 1000 if lags else 0,
+            "lag_p99_ms": lags[int(len(lags) * 0.99)] * 1000 if lags else 0,
+            "service_calls": len(hass.services.calls) - calls,
+            "state_writes": hass.states.writes - writes,
+            "peak_calls_per_s": peak_calls,
+            "gateway_queue": gateway_queue,
+        }
+
+
+async def scenario(house, recorder):
+    """Script of the simulated day, every phase ends when all covers stopped."""
+    hass = house.hass
+    settle = house.longest_travel + 2
+
+    async def open_all():
+        await asyncio.gather(*(cover.async_open_cover() for cover in house.covers))
+        await asyncio.sleep(settle)
+
+    async def sunset():
+        now = house.loop.utcnow()
+        set_sun(hass, now + timedelta(minutes=1), now + timedelta(hours=10))
+        spread = async_get_schedule_engine(hass).spread.total_seconds()
+        await asyncio.sleep(60 + spread + settle)
+
+    async def weather_event():
+        house.weather_session.payload = STORM
+        await house.weather.async_refresh(force=True)
+        await asyncio.sleep(settle)
+        house.weather_session.payload = CALM
+
+    async def close_all():
+        await asyncio.gather(*(cover.async_close_cover() for cover in house.covers))
+        await asyncio.sleep(settle)
+
+    await house.async_setup()
+    for name, phase in (
+        ("open_all", open_all),
+        ("sunset", sunset),
+        ("weather", weather_event),
+        ("close_all", close_all),
+    ):
+        await recorder.measure(name, phase)
+
+
+def run(count, allocations=False, spread=DEFAULT_SPREAD):
+    loop = VirtualClockLoop()
+    try:
+        house = House(loop, count)
+        async_get_schedule_engine(house.hass).spread = spread
+        recorder = PhaseRecorder(house, allocations)
+        if allocations:
+            tracemalloc.start()
+        loop.run_until_complete(scenario(house, recorder))
+    finally:
+        if allocations:
+            tracemalloc.stop()
+        loop.close()
+    return recorder.results
+
+
+def compare(results, baseline):
+    print("\nchange against the baseline (lower is better):")
+    for count, phases in results.items():
+        for name, metrics in phases.items():
+            old = baseline.get(count, {}).get(name)
+            if old is None:
+                continue
+            changes = []
+            for metric in COMPARED:
+                if old.get(metric) and metric in metrics:
+                    changes.append(f"{metric} {100 * (metrics[metric] / old[metric] - 1):+.0f}%")
+            print(f"{count:>6} {name:>10}  " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--covers", type=int, nargs="+", default=COVERS)
+    parser.add_argument("--output", default=RESULTS, help="where to save the results")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument(
+        "--spread", type=float, default=DEFAULT_SPREAD.total_seconds(),
+        help="seconds the scheduled actions are spread over",
+    )
+    args = parser.parse_args()
+    spread = timedelta(seconds=args.spread)
+
+    results = {}
+    print(
+        f"{'covers':>6} {'phase':>10} {'sim s':>7} {'cpu ms/s':>9} {'lag max':>8} "
+        f"{'lag p99':>8} {'calls':>7} {'writes':>8} {'calls/s':>8} {'gw queue':>9} {'alloc KiB':>10}"
+    )
+    for count in args.covers:
+        phases = run(count, spread=spread)
+        if not args.no_allocations:
+            for name, metrics in run(count, allocations=True, spread=spread).items():
+                phases[name].update(metrics)
+        results[str(count)] = phases
+        for name, m in phases.items():
+            print(
+                f"{count:>6} {name:>10} {m['sim_seconds']:>7.1f} {m['cpu_ms_per_sim_s']:>9.2f} "
+                f"{m['lag_max_ms']:>8.2f} {m['lag_p99_ms']:>8.2f} {m['service_calls']:>7} "
+                f"{m['state_writes']:>8} {m['peak_calls_per_s']:>8} {m['gateway_queue']:>9} "
+                f"{m.get('alloc_peak_kib', 0):>10.0f}"
+            )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nresults saved to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Simulation of the motor limits of the relay groups on a virtual clock.
+
+N covers (60 by default) are split into relay groups of 12 sharing one power supply.
+All covers are open when the sunset schedule closes them all at once (the schedule
+spread is turned off for the worst case), 20 s later a storm makes the weather
+protection open the covers that already closed. For every motor limit the script
+reports the most motors that ran at once in a group, the time until every cover
+stopped and how long the queued moves of each priority waited for a motor.
+
+Run from the repository root:  python -m benchmarks.bench_motors [--covers 60]
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+
+from custom_components.blinds_controller.motors import async_get_motor_scheduler
+from custom_components.blinds_controller.scheduler import async_get_schedule_engine
+
+from .fake_hass import VirtualClockLoop
+from .house import CALM, STORM, House, set_sun
+
+GROUP_SIZE = 12
+LIMITS = (None, 6, 4, 2)
+
+
+class MotorMonitor:
+    """Counts the motors running per relay group from the relay states."""
+
+    def __init__(self, house):
+        self.house = house
+        self.groups = {}
+        self.running = {}
+        self.peak = 0
+        self.last_stop = 0.0
+        for cover in house.covers:
+            self.groups[cover._up_switch_entity_id] = cover._motor_group
+            self.groups[cover._down_switch_entity_id] = cover._motor_group
+        house.hass.bus.async_listen("state_changed", self._state_changed)
+
+    def _state_changed(self, event):
+        group = self.groups.get(event.data["entity_id"])
+        if group is None:
+            return
+        old_state = event.data["old_state"]
+        was_on = old_state is not None and old_state.state == "on"
+        is_on = event.data["new_state"].state == "on"
+        if was_on == is_on:
+            return
+        running = self.running.setdefault(group, set())
+        if is_on:
+            running.add(event.data["entity_id"])
+            self.peak = max(self.peak, len(running))
+        else:
+            running.discard(event.data["entity_id"])
+            self.last_stop = self.house.loop.time()
+
+
+async def scenario(house, limit):
+    """Close all covers at sunset with a storm in the middle, return the monitor."""
+    hass = house.hass
+    async_get_schedule_engine(hass).spread = timedelta(0)
+    await house.async_setup()
+    await asyncio.gather(*(cover.async_open_cover() for cover in house.covers))
+    await asyncio.sleep(house.longest_travel + 2)
+
+    scheduler = async_get_motor_scheduler(hass)
+    groups = {cover._motor_group for cover in house.covers}
+    scheduler.limits = {group: limit for group in groups} if limit is not None else {}
+    monitor = MotorMonitor(house)
+
+    now = house.loop.utcnow()
+    set_sun(hass, now + timedelta(seconds=10), now + timedelta(hours=10))
+    await asyncio.sleep(10)
+    started = house.loop.time()
+    await asyncio.sleep(20)
+    house.weather_session.payload = STORM
+    await house.weather.async_refresh(force=True)
+    house.weather_session.payload = CALM
+    while len(scheduler) or any(cover._arrival_deadline is not None for cover in house.covers):
+        await asyncio.sleep(1)
+    return monitor, monitor.last_stop - started, scheduler
+
+
+def run(count, limit):
+    loop = VirtualClockLoop()
+    try:
+        house = House(loop, count, group_size=GROUP_SIZE)
+        return loop.run_until_complete(scenario(house, limit))
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--covers", type=int, default=60)
+    args = parser.parse_args()
+    print(
+        f"{'limit':>6} {'peak motors':>12} {'done s':>7} {'protection wait max s':>22} "
+        f"{'schedule wait mean s':>21} {'schedule wait max s':>20}"
+    )
+    for limit in LIMITS:
+        monitor, elapsed, scheduler = run(args.covers, limit)
+        protection = scheduler.waits[0]
+        schedule = scheduler.waits[2]
+        mean = schedule.total / schedule.calls if schedule.calls else 0
+        print(
+            f"{str(limit or '-'):>6} {monitor.peak:>12} {elapsed:>7.1f} {protection.max:>22.1f} "
+            f"{mean:>21.1f} {schedule.max:>20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
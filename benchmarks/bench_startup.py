@@ -0,0 +1,134 @@
+"""
+Benchmark of the startup of many covers in a real Home Assistant instance.
+
+Sets up N covers once as N config entries and once as a single batch entry
+imported from YAML, and measures the time until all cover states exist, the
+number of config entries and the size of the stored config entries. With
+--late-relays the relays are loaded after the covers, which start unavailable
+and become available as their relays appear.
+
+Run from the repository root:  python -m benchmarks.bench_startup
+"""
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from homeassistant import config_entries, loader
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry, device_registry, entity, entity_registry, floor_registry, issue_registry,
+    label_registry, restore_state, template, translation,
+)
+from homeassistant.setup import async_setup_component
+
+from custom_components.blinds_controller.batch import BATCH_SCHEMA
+from custom_components.blinds_controller.const import DOMAIN
+
+from .house import COVER_DATA
+
+REPO = Path(__file__).resolve().parent.parent
+REGISTRIES = (
+    area_registry, device_registry, entity_registry, issue_registry,
+    floor_registry, label_registry, restore_state,
+)
+
+
+async def start_hass(config_dir):
+    """Start a minimal Home Assistant."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    translation.async_setup(hass)
+    entity.async_setup(hass)
+    template.async_setup(hass)
+    await asyncio.gather(*(registry.async_load(hass) for registry in REGISTRIES))
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    assert await async_setup_component(hass, "homeassistant", {})
+    return hass
+
+
+async def setup_relays(hass, covers_count):
+    """Load the relays of the covers."""
+    relays = {f"blind_{index}_{way}": {} for index in range(covers_count) for way in ("up", "down")}
+    assert await async_setup_component(hass, "input_boolean", {"input_boolean": relays})
+
+
+def cover_data(index):
+    """Return the options of one simulated cover."""
+    return {
+        **COVER_DATA,
+        # No weather requests leave the benchmark
+        "protect_the_blinds": False,
+        "entity_up": f"input_boolean.blind_{index}_up",
+        "entity_down": f"input_boolean.blind_{index}_down",
+    }
+
+
+async def add_entries(hass, covers_count):
+    """Add one config entry per cover."""
+    for index in range(covers_count):
+        entry = config_entries.ConfigEntry(
+            version=1, minor_version=1, domain=DOMAIN, title=f"Blind {index}",
+            data={**cover_data(index), "ent_name": f"Blind {index}"}, source="user", options={},
+        )
+        await hass.config_entries.async_add(entry)
+
+
+async def add_batch(hass, covers_count):
+    """Import all covers as one batch entry."""
+    covers = [{**cover_data(index), "name": f"Blind {index}"} for index in range(covers_count)]
+    batch = BATCH_SCHEMA({"name": "House", "covers": covers})
+    await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_IMPORT}, data=batch)
+
+
+def available_covers(hass):
+    """Return the number of covers that can be driven."""
+    return sum(state.state != "unavailable" for state in hass.states.async_all("cover"))
+
+
+async def run(covers_count, setup, late_relays):
+    """Return the startup time, entry count, stored entry size and available covers of one layout."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(REPO / "custom_components", Path(config_dir) / "custom_components")
+        hass = await start_hass(config_dir)
+        if not late_relays:
+            await setup_relays(hass, covers_count)
+        started = time.perf_counter()
+        await setup(hass, covers_count)
+        await hass.async_block_till_done()
+        while len(hass.states.async_entity_ids("cover")) < covers_count:
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - started
+        if late_relays:
+            await setup_relays(hass, covers_count)
+            await hass.async_block_till_done()
+        available = available_covers(hass)
+        entries = hass.config_entries.async_entries(DOMAIN)
+        await hass.async_stop(force=True)
+        size = os.path.getsize(Path(config_dir) / ".storage" / "core.config_entries")
+    return elapsed, len(entries), size, available
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--covers", type=int, default=150)
+    parser.add_argument("--late-relays", action="store_true", help="load the relays after the covers")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    print(f"{'layout':>10} {'covers':>7} {'entries':>8} {'startup s':>10} {'stored kB':>10} {'available':>10}")
+    for layout, setup in (("entries", add_entries), ("batch", add_batch)):
+        elapsed, entries, size, available = asyncio.run(run(args.covers, setup, args.late_relays))
+        print(
+            f"{layout:>10} {args.covers:>7} {entries:>8} {elapsed:>10.2f} {size / 1024:>10.1f} "
+            f"{available:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
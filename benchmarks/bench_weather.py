@@ -0,0 +1,151 @@
+"""
+Benchmark of the weather requests made by many covers.
+
+Starts a local stand-in for the Open-Meteo API, subscribes N covers to the shared
+weather coordinator and counts the requests the server receives. The stand-in can
+answer normally, answer slower than the request timeout, fail, or fail a few times
+and then recover, which shows the backoff and circuit breaker keeping the number of
+requests and threads bounded.
+
+Every run is checked against the guarantees of the coordinator: at most one request
+per interval however many covers share it (plus a few retries while failing), no
+executor job and no thread per cover, and the status expected after the failures and
+the backoff. A broken guarantee fails the script with a non-zero exit code.
+
+Run from the repository root:  python -m benchmarks.bench_weather
+"""
+import asyncio
+from datetime import timedelta
+import threading
+
+from aiohttp import ClientSession, web
+
+from custom_components.blinds_controller import weather
+
+from .fake_hass import FakeHass, fake_call_later, fake_track_time_interval
+
+INTERVAL = timedelta(seconds=0.2)
+INTERVALS = 5
+TIMEOUT = timedelta(seconds=0.05)
+BACKOFF_MIN = timedelta(seconds=0.05)
+BACKOFF_MAX = timedelta(seconds=0.4)
+RESPONSE = {"current": {"wind_speed_10m": 12.5}, "daily": {"weather_code": [3, 61]}}
+
+MODES = ("ok", "slow", "failing", "recovering")
+COVER_COUNTS = (1, 10, 100)
+# Status of the coordinator at the end of each mode
+EXPECTED_STATUS = {
+    "ok": weather.STATUS_OK,
+    "slow": weather.STATUS_UNAVAILABLE,
+    "failing": weather.STATUS_UNAVAILABLE,
+    "recovering": weather.STATUS_OK,
+}
+# One request per interval, plus the retries made before the circuit opens
+MAX_REQUESTS = INTERVALS + 1 + weather.FAILURE_THRESHOLD
+# Executor jobs running at once and threads started, whatever the number of covers
+MAX_EXECUTOR_JOBS = 1
+MAX_THREADS = 1
+
+
+async def start_server(handler):
+    """Start a stand-in API on a free local port, return the runner and its url."""
+    app = web.Application()
+    app.router.add_get("/v1/forecast", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/v1/forecast"
+
+
+async def run(covers_count, mode):
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            if mode == "slow":
+                await asyncio.sleep(1)
+            if mode == "failing" or (
+                mode == "recovering" and stats["requests"] <= weather.FAILURE_THRESHOLD
+            ):
+                return web.Response(status=500)
+            return web.json_response(RESPONSE)
+        finally:
+            stats["in_flight"] -= 1
+
+    runner, url = await start_server(handler)
+    hass = FakeHass(asyncio.get_running_loop())
+    readings = 0
+
+    def listener(data):
+        nonlocal readings
+        readings += 1
+
+    threads_before = threading.active_count()
+    async with ClientSession() as session:
+        coordinator = weather.WeatherCoordinator(
+            hass, 49.2, 16.6, url, interval=INTERVAL, session=session, timeout=TIMEOUT,
+            backoff_min=BACKOFF_MIN, backoff_max=BACKOFF_MAX,
+        )
+        removers = [coordinator.async_subscribe(listener) for _ in range(covers_count)]
+        # Covers asking at the same moment share one request
+        await asyncio.gather(*(coordinator.async_refresh() for _ in range(covers_count)))
+        await asyncio.sleep(INTERVAL.total_seconds() * INTERVALS + 0.05)
+        threads = threading.active_count() - threads_before
+        status = coordinator.status
+        for remove in removers:
+            remove()
+    await runner.cleanup()
+    stats.update(
+        readings=readings, status=status, threads=threads,
+        executor_jobs=hass.executor_jobs, executor_peak=hass.executor_peak,
+    )
+    return stats
+
+
+def check(mode, covers_count, stats):
+    """Return the guarantees the run broke."""
+    problems = []
+    if stats["requests"] > MAX_REQUESTS:
+        problems.append(f"{stats['requests']} requests in {INTERVALS + 1} intervals")
+    if stats["executor_peak"] > MAX_EXECUTOR_JOBS:
+        problems.append(f"{stats['executor_peak']} executor jobs at once")
+    if stats["threads"] > MAX_THREADS:
+        problems.append(f"{stats['threads']} threads started")
+    if stats["status"] != EXPECTED_STATUS[mode]:
+        problems.append(f"status {stats['status']} instead of {EXPECTED_STATUS[mode]}")
+    if mode == "ok" and stats["max_in_flight"] > 1:
+        problems.append(f"{stats['max_in_flight']} requests in flight at once")
+    if EXPECTED_STATUS[mode] == weather.STATUS_OK and stats["readings"] < covers_count:
+        problems.append(f"{stats['readings']} readings for {covers_count} covers")
+    return [f"{mode} with {covers_count} covers: {problem}" for problem in problems]
+
+
+def main():
+    weather.async_track_time_interval = fake_track_time_interval
+    weather.async_call_later = fake_call_later
+    print(
+        f"{'mode':>10} {'covers':>7} {'intervals':>9} {'requests':>9} "
+        f"{'server in flight':>16} {'readings':>9} {'executor':>9} {'threads':>8} {'status':>12}"
+    )
+    problems = []
+    for mode in MODES:
+        for covers_count in COVER_COUNTS:
+            stats = asyncio.run(run(covers_count, mode))
+            print(
+                f"{mode:>10} {covers_count:>7} {INTERVALS + 1:>9} {stats['requests']:>9} "
+                f"{stats['max_in_flight']:>16} {stats['readings']:>9} {stats['executor_jobs']:>9} "
+                f"{stats['threads']:>8} {stats['status']:>12}"
+            )
+            problems.extend(check(mode, covers_count, stats))
+    if problems:
+        raise SystemExit("\n".join(["FAILED:", *problems]))
+    print("\nall checks passed")
+
+
+if __name__ == "__main__":
+    main()
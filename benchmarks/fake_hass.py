@@ -0,0 +1,239 @@
+"""
+Minimal in-process stand-in for the parts of Home Assistant the benchmarks touch.
+
+Only what is needed to drive the integration code is implemented: a state machine,
+an event bus delivering state changed events, a service registry recording the calls
+and a task runner on a real asyncio loop. The benchmarks require the homeassistant
+package to be importable (the integration modules import it), but they never start a
+real Home Assistant instance.
+
+VirtualClockLoop is an asyncio loop whose clock jumps to the next timer as soon as
+nothing is ready to run, so hours of simulated time pass in a few seconds. It also
+records how long every loop iteration blocked, which is the event loop lag a real
+instance would see.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import heapq
+import time
+from types import SimpleNamespace
+
+VIRTUAL_EPOCH = datetime(2026, 6, 21, 4, 0, tzinfo=timezone.utc)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop running on virtual time, idle waits take no wall clock time."""
+
+    def __init__(self, epoch=VIRTUAL_EPOCH):
+        super().__init__()
+        self.epoch = epoch
+        self._virtual_time = 0.0
+        # The loop runs the timers due before time() + resolution, past 2**24 s (194 days)
+        # adding the 1 ns of the monotonic clock no longer changes the float
+        self._clock_resolution = 1e-6
+        # Wall clock seconds each iteration blocked the loop, while recording
+        self.iteration_times = None
+
+    def time(self):
+        return self._virtual_time
+
+    def utcnow(self):
+        """Return the virtual date and time, for homeassistant.util.dt.utcnow."""
+        return self.epoch + timedelta(seconds=self._virtual_time)
+
+    def _run_once(self):
+        # Drop cancelled timers first, the clock must only jump to a live one
+        while self._scheduled and self._scheduled[0]._cancelled:
+            self._timer_cancelled_count -= 1
+            heapq.heappop(self._scheduled)._scheduled = False
+        if not self._ready and self._scheduled:
+            self._virtual_time = max(self._virtual_time, self._scheduled[0]._when)
+        iteration_times = self.iteration_times
+        if iteration_times is None:
+            super()._run_once()
+            return
+        started = time.perf_counter()
+        super()._run_once()
+        iteration_times.append(time.perf_counter() - started)
+
+
+class FakeState:
+    """State object with the attributes the integration reads."""
+
+    def __init__(self, entity_id, state, attributes=None):
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes or {}
+
+
+class FakeStates:
+    """State machine keeping the last state of every entity."""
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._states = {}
+        self.writes = 0
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def async_entity_ids(self):
+        return list(self._states)
+
+    def async_set(self, entity_id, state, attributes=None):
+        old_state = self._states.get(entity_id)
+        new_state = FakeState(entity_id, state, attributes)
+        self._states[entity_id] = new_state
+        self.writes += 1
+        self._hass.bus.async_fire_state_changed(entity_id, old_state, new_state)
+
+
+class FakeBus:
+    """Event bus with global listeners and entity keyed state change listeners."""
+
+    def __init__(self):
+        self.listeners = []
+        self.entity_listeners = {}
+        self.listener_calls = 0
+
+    def async_listen(self, event_type, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    def async_fire_state_changed(self, entity_id, old_state, new_state):
+        event = SimpleNamespace(
+            event_type="state_changed",
+            data={"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+        )
+        for listener in tuple(self.listeners):
+            self.listener_calls += 1
+            listener(event)
+        for listener in tuple(self.entity_listeners.get(entity_id, ())):
+            self.listener_calls += 1
+            listener(event)
+
+
+class FakeServices:
+    """Service registry recording every call, turn_on and turn_off switch the entities."""
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._handlers = {}
+        self.calls = []
+        # (loop time, number of entities) of every call, for rates and gateway queues
+        self.call_log = []
+
+    def async_register(self, domain, service, handler, schema=None):
+        self._handlers[(domain, service)] = handler
+
+    async def async_call(self, domain, service, data=None, blocking=False, **kwargs):
+        data = data or {}
+        self.calls.append((domain, service))
+        entity_ids = data.get("entity_id", [])
+        self.call_log.append(
+            (self._hass.loop.time(), 1 if isinstance(entity_ids, str) else max(len(entity_ids), 1))
+        )
+        handler = self._handlers.get((domain, service))
+        if handler is not None:
+            await handler(SimpleNamespace(domain=domain, service=service, data=data))
+            return
+        if service in ("turn_on", "turn_off"):
+            entity_ids = data.get("entity_id", [])
+            if isinstance(entity_ids, str):
+                entity_ids = [entity_ids]
+            for entity_id in entity_ids:
+                self._hass.states.async_set(entity_id, service[5:])
+
+
+class FakeHass:
+    """Home Assistant stand-in running on the given asyncio loop."""
+
+    def __init__(self, loop=None):
+        self.loop = loop or asyncio.get_event_loop()
+        self.data = {}
+        self.bus = FakeBus()
+        self.states = FakeStates(self)
+        self.services = FakeServices(self)
+        self.config = SimpleNamespace(latitude=50.08, longitude=14.42)
+        self.tasks_created = 0
+        # Jobs handed to the executor and the most that ran at once
+        self.executor_jobs = 0
+        self.executor_peak = 0
+        self._executor_running = 0
+
+    def async_create_task(self, target):
+        self.tasks_created += 1
+        return self.loop.create_task(target)
+
+    async def async_add_executor_job(self, target, *args):
+        self.executor_jobs += 1
+        self._executor_running += 1
+        self.executor_peak = max(self.executor_peak, self._executor_running)
+        try:
+            return await self.loop.run_in_executor(None, target, *args)
+        finally:
+            self._executor_running -= 1
+
+
+def fake_time(loop):
+    """Stand-in for the time module on the virtual clock, perf_counter stays real."""
+    return SimpleNamespace(
+        monotonic=loop.time,
+        time=lambda: loop.utcnow().timestamp(),
+        perf_counter=time.perf_counter,
+    )
+
+
+def fake_track_state_change_event(hass, entity_ids, action):
+    """Drop-in for homeassistant.helpers.event.async_track_state_change_event."""
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+    for entity_id in entity_ids:
+        hass.bus.entity_listeners.setdefault(entity_id, []).append(action)
+
+    def remove():
+        for entity_id in entity_ids:
+            hass.bus.entity_listeners[entity_id].remove(action)
+
+    return remove
+
+
+def fake_track_time_interval(hass, action, interval):
+    """Drop-in for homeassistant.helpers.event.async_track_time_interval."""
+    seconds = interval.total_seconds()
+    handle = None
+
+    def run():
+        nonlocal handle
+        handle = hass.loop.call_later(seconds, run)
+        result = action(None)
+        if asyncio.iscoroutine(result):
+            hass.async_create_task(result)
+
+    handle = hass.loop.call_later(seconds, run)
+    return lambda: handle.cancel()
+
+
+def fake_call_later(hass, delay, action):
+    """Drop-in for homeassistant.helpers.event.async_call_later."""
+
+    def run():
+        result = action(None)
+        if asyncio.iscoroutine(result):
+            hass.async_create_task(result)
+
+    handle = hass.loop.call_later(delay, run)
+    return lambda: handle.cancel()
+
+
+def fake_track_point_in_utc_time(hass, action, point_in_time):
+    """Drop-in for homeassistant.helpers.event.async_track_point_in_utc_time on a virtual loop."""
+
+    def run():
+        result = action(point_in_time)
+        if asyncio.iscoroutine(result):
+            hass.async_create_task(result)
+
+    delay = (point_in_time - hass.loop.utcnow()).total_seconds()
+    handle = hass.loop.call_later(max(0, delay), run)
+    return lambda: handle.cancel()
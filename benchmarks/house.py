@@ -0,0 +1,199 @@
+"""
+Simulated house of blinds driven by the real BlindsCover entities.
+
+The covers run on a FakeHass bound to a VirtualClockLoop. patch_integration() points the
+Home Assistant helpers imported by the integration modules at the fake time tracking, so
+timers, the motion ticker and the schedule all follow the virtual clock. Relays are
+input_booleans switched by the fake services, their state changes reach the covers as
+they would in a real instance.
+"""
+from datetime import timedelta
+import random
+from types import SimpleNamespace
+
+import homeassistant.util.dt as dt_util
+
+from custom_components.blinds_controller import (
+    cover as cover_module,
+    dispatcher as dispatcher_module,
+    pipeline as pipeline_module,
+    relays as relays_module,
+    scheduler as scheduler_module,
+    sun as sun_module,
+    ticker as ticker_module,
+    weather as weather_module,
+)
+from custom_components.blinds_controller.const import (
+    SUN_NEXT_DAWN_ENTITY,
+    SUN_NEXT_DUSK_ENTITY,
+)
+from custom_components.blinds_controller.ticker import async_get_motion_ticker
+from custom_components.blinds_controller.weather import async_get_weather_coordinator
+
+from .fake_hass import (
+    FakeHass,
+    fake_call_later,
+    fake_time,
+    fake_track_point_in_utc_time,
+    fake_track_state_change_event,
+    fake_track_time_interval,
+)
+
+CALM = {"current": {"wind_speed_10m": 5.0}, "daily": {"weather_code": [1, 1]}}
+STORM = {"current": {"wind_speed_10m": 80.0}, "daily": {"weather_code": [95, 95]}}
+
+# Options of a cover as stored in its config entry
+COVER_DATA = dict(
+    time_up=30.0, time_down=30.0, tilt_open=0.0, tilt_closed=0.0,
+    timed_control_down=False, time_to_roll_down="22:00",
+    timed_control_up=False, time_to_roll_up="07:00",
+    delay_control=True, delay_sunrise=0, delay_sunset=0,
+    night_lights=False, entity_night_lights=None, tilting_day=False,
+    protect_the_blinds=True, wind_speed=50, wmo_code=80,
+    netamo_enable=False, netamo_speed_entity=None, netamo_speed=30,
+    netamo_gust_entity=None, netamo_gust=40, netamo_rain_entity=None, netamo_rain=40,
+    send_stop_at_end=True,
+)
+
+
+class FakeResponse:
+    """aiohttp response with the parts the weather coordinator reads."""
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self._payload
+
+
+class FakeWeatherSession:
+    """aiohttp session answering every forecast request with the current payload."""
+
+    def __init__(self):
+        self.payload = CALM
+        # Callable returning the payload of every request instead, e.g. a weather feed
+        self.feed = None
+        self.requests = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.requests += 1
+        return FakeResponse(self.payload if self.feed is None else self.feed())
+
+
+class FakeJournal:
+    """Travel journal kept in memory instead of .storage."""
+
+    def __init__(self):
+        self.records = {}
+
+    async def async_load(self):
+        pass
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def async_record(self, key, record):
+        self.records[key] = record
+
+
+class SimCover(cover_module.BlindsCover):
+    """BlindsCover running outside an entity platform."""
+
+    def __init__(self, hass, index, data):
+        entry = SimpleNamespace(data=data, entry_id=f"blind_{index}", title=f"Blind {index}")
+        super().__init__(hass, entry, entry.title, entry.entry_id)
+        self.entity_id = f"cover.blind_{index}"
+        self._no_platform_reported = True
+
+    async def async_get_last_state(self):
+        return None
+
+    def _async_write_ha_state(self):
+        # What Home Assistant computes for the state machine, without the registries
+        attributes = dict(self.state_attributes or {})
+        attributes.update(self.extra_state_attributes or {})
+        attributes["supported_features"] = self.supported_features
+        self.hass.states.async_set(self.entity_id, self.state, attributes)
+
+
+def patch_integration(weather_session):
+    """Point the Home Assistant helpers used by the integration at the fakes."""
+    journal = FakeJournal()
+    cover_module.async_get_travel_journal = lambda hass: journal
+    cover_module.async_call_later = fake_call_later
+    pipeline_module.async_call_later = fake_call_later
+    weather_module.async_call_later = fake_call_later
+    weather_module.async_track_time_interval = fake_track_time_interval
+    weather_module.async_get_clientsession = lambda hass: weather_session
+    ticker_module.async_track_time_interval = fake_track_time_interval
+    relays_module.async_track_time_interval = fake_track_time_interval
+    dispatcher_module.async_track_state_change_event = fake_track_state_change_event
+    sun_module.async_track_state_change_event = fake_track_state_change_event
+    scheduler_module.async_track_point_in_utc_time = fake_track_point_in_utc_time
+
+
+def set_sun(hass, dusk, dawn):
+    """Publish the next dusk and dawn like the sun integration does."""
+    hass.states.async_set(SUN_NEXT_DUSK_ENTITY, dusk.isoformat())
+    hass.states.async_set(SUN_NEXT_DAWN_ENTITY, dawn.isoformat())
+
+
+class House:
+    """Covers of a simulated house on a virtual clock loop."""
+
+    def __init__(self, loop, count, seed=1, tilt_every=4, group_size=0, overrides=None):
+        self.loop = loop
+        self.weather_session = FakeWeatherSession()
+        patch_integration(self.weather_session)
+        dt_util.utcnow = loop.utcnow
+        # Hold times, journal and weather cache ages follow the virtual clock too
+        cover_module.time = weather_module.time = fake_time(loop)
+        self.hass = FakeHass(loop)
+        # Calculators follow the virtual clock too
+        async_get_motion_ticker(self.hass).bank.clock = loop
+        rng = random.Random(seed)
+        self.covers = []
+        for index in range(count):
+            data = dict(COVER_DATA)
+            data["entity_up"] = f"input_boolean.blind_{index}_up"
+            data["entity_down"] = f"input_boolean.blind_{index}_down"
+            data["time_up"] = round(rng.uniform(15, 40), 1)
+            data["time_down"] = round(data["time_up"] * 0.9, 1)
+            if tilt_every and index % tilt_every == 0:
+                data["tilt_open"] = data["tilt_closed"] = 1.5
+            if group_size:
+                data["motor_group"] = f"module_{index // group_size}"
+            data.update(overrides or {})
+            self.covers.append(SimCover(self.hass, index, data))
+
+    @property
+    def longest_travel(self):
+        """Return the longest full travel time of all covers."""
+        return max(max(cover._travel_time_up, cover._travel_time_down) for cover in self.covers)
+
+    async def async_setup(self):
+        """Create the relays and sun sensors, then add the covers."""
+        now = self.loop.utcnow()
+        set_sun(self.hass, now.replace(hour=19), now.replace(hour=3) + timedelta(days=1))
+        for cover in self.covers:
+            self.hass.states.async_set(cover._up_switch_entity_id, "off")
+            self.hass.states.async_set(cover._down_switch_entity_id, "off")
+        for cover in self.covers:
+            await cover.async_added_to_hass()
+            cover.async_write_ha_state()
+
+    @property
+    def weather(self):
+        """Return the weather coordinator shared by the covers."""
+        return async_get_weather_coordinator(
+            self.hass, self.hass.config.latitude, self.hass.config.longitude
+        )
@@ -0,0 +1,231 @@
+"""
+Year simulator of the schedules, sun offsets and weather rules of a house of blinds.
+
+N covers run the real BlindsCover code on the virtual clock loop, so a year passes in
+well under a minute. The sun sensors are fed with the dawn and dusk of every day at
+the configured location and the weather coordinator with a synthetic feed (seeded,
+so every run is the same) or a recorded one, a CSV file with the columns time,
+wind_speed and weather_code in hourly or any other steps.
+
+The output is a timeline with one line per relay command and per cover state change,
+in virtual local time and without anything measured on the wall clock. Two runs with
+the same options give the same file, so configurations and releases can be compared
+with diff:
+
+    python -m benchmarks.simulate_year --output /tmp/a.txt
+    python -m benchmarks.simulate_year --set delay_sunset=15 --output /tmp/b.txt
+    diff /tmp/a.txt /tmp/b.txt
+
+Options of the covers are changed with --set key=value (values are read as JSON, e.g.
+--set timed_control_up=true --set time_to_roll_up='"06:30"'), options of the YAML
+configuration are set on the shared objects, see --spread.
+
+Run from the repository root:  python -m benchmarks.simulate_year [--days 365]
+"""
+import argparse
+import asyncio
+import bisect
+import csv
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import random
+import time
+
+from astral import Observer
+from astral.sun import dawn, dusk
+import homeassistant.util.dt as dt_util
+
+from custom_components.blinds_controller.scheduler import DEFAULT_SPREAD, async_get_schedule_engine
+from custom_components.blinds_controller.ticker import async_get_motion_ticker
+
+from .fake_hass import VirtualClockLoop
+from .house import House, set_sun
+
+TIMELINE = os.path.join(os.path.dirname(__file__), "results", "timeline.txt")
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class SunFeed:
+    """Publishes the next dawn and dusk and moves them on right at the events."""
+
+    def __init__(self, hass, latitude, longitude):
+        self.hass = hass
+        self.observer = Observer(latitude, longitude)
+
+    def _next(self, event, now):
+        for days in range(-1, 3):
+            try:
+                when = event(self.observer, now.date() + timedelta(days=days), tzinfo=timezone.utc)
+            except ValueError:
+                # No such event that day (polar day or night)
+                continue
+            if when > now:
+                return when
+        return None
+
+    def start(self):
+        loop = self.hass.loop
+        now = loop.utcnow()
+        next_dawn = self._next(dawn, now)
+        next_dusk = self._next(dusk, now)
+        set_sun(self.hass, next_dusk, next_dawn)
+        events = [when for when in (next_dawn, next_dusk) if when is not None]
+        delay = (min(events) - now).total_seconds() if events else 86400
+        loop.call_later(delay, self.start)
+
+
+class SyntheticWeather:
+    """Hourly wind and weather codes drawn from a seeded generator, windier in winter."""
+
+    def __init__(self, loop, seed):
+        self.loop = loop
+        self.seed = seed
+
+    def __call__(self):
+        now = self.loop.utcnow()
+        hour = int(now.timestamp() // 3600)
+        rng = random.Random(f"{self.seed}-{hour}")
+        winter = 1 + 0.4 * abs(6.5 - now.month) / 5.5
+        wind_speed = round(rng.weibullvariate(14 * winter, 2), 1)
+        # A day is rainy or stormy as a whole
+        day = random.Random(f"{self.seed}-{now.date()}").random()
+        weather_code = 95 if day < 0.03 else 63 if day < 0.15 else 3
+        return {"current": {"wind_speed_10m": wind_speed}, "daily": {"weather_code": [weather_code]}}
+
+
+class RecordedWeather:
+    """Readings of a CSV file, the latest one before the virtual time is returned."""
+
+    def __init__(self, loop, path):
+        self.loop = loop
+        with open(path, encoding="utf-8") as file:
+            rows = sorted(
+                (dt_util.parse_datetime(row["time"]), float(row["wind_speed"]), int(row["weather_code"]))
+                for row in csv.DictReader(file)
+            )
+        self.times = [row[0] for row in rows]
+        self.rows = rows
+
+    def __call__(self):
+        index = bisect.bisect_right(self.times, self.loop.utcnow()) - 1
+        _, wind_speed, weather_code = self.rows[max(index, 0)]
+        return {"current": {"wind_speed_10m": wind_speed}, "daily": {"weather_code": [weather_code]}}
+
+
+class Timeline:
+    """Records the relay commands and the cover state changes in virtual local time."""
+
+    def __init__(self, house):
+        self.house = house
+        self.lines = []
+        self.relays = {}
+        for cover in house.covers:
+            self.relays[cover._up_switch_entity_id] = cover.entity_id
+            self.relays[cover._down_switch_entity_id] = cover.entity_id
+        house.hass.bus.async_listen("state_changed", self._state_changed)
+
+    def _state_changed(self, event):
+        entity_id = event.data["entity_id"]
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        if old_state is not None and old_state.state == new_state.state:
+            return
+        if entity_id in self.relays:
+            line = f"{self.relays[entity_id]} relay {entity_id} {new_state.state}"
+        elif entity_id.startswith("cover."):
+            position = new_state.attributes.get("current_position")
+            line = f"{entity_id} {new_state.state} {position}"
+        else:
+            return
+        when = dt_util.as_local(self.house.loop.utcnow()).replace(microsecond=0).isoformat()
+        self.lines.append(f"{when} {line}")
+
+    def summary(self):
+        """Return the number of relay commands and moves per cover."""
+        counts = {}
+        for line in self.lines:
+            _, entity_id, kind, *rest = line.split(" ")
+            cover = counts.setdefault(entity_id, {"relay": 0, "opening": 0, "closing": 0})
+            if kind in cover:
+                cover[kind] += 1
+        return counts
+
+
+async def simulate(house, args):
+    hass = house.hass
+    async_get_schedule_engine(hass).spread = timedelta(seconds=args.spread)
+    # Only the published positions depend on the tick, relays are switched on arrival
+    async_get_motion_ticker(hass).interval = timedelta(seconds=args.tick)
+    if args.weather:
+        house.weather_session.feed = RecordedWeather(house.loop, args.weather)
+    else:
+        house.weather_session.feed = SyntheticWeather(house.loop, args.seed)
+    await house.async_setup()
+    timeline = Timeline(house)
+    SunFeed(hass, hass.config.latitude, hass.config.longitude).start()
+    await asyncio.sleep(args.days * 86400)
+    return timeline
+
+
+def parse_overrides(pairs):
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--covers", type=int, default=10)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--start", default=START.date().isoformat(), help="first simulated day (UTC)")
+    parser.add_argument("--time-zone", default="Europe/Prague")
+    parser.add_argument("--latitude", type=float, default=50.08)
+    parser.add_argument("--longitude", type=float, default=14.42)
+    parser.add_argument("--seed", type=int, default=1, help="seed of the synthetic weather and the covers")
+    parser.add_argument("--weather", help="CSV file with recorded weather (time, wind_speed, weather_code)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="cover option")
+    parser.add_argument("--spread", type=float, default=DEFAULT_SPREAD.total_seconds(),
+                        help="seconds the scheduled actions are spread over")
+    parser.add_argument("--tick", type=float, default=1.0, help="seconds between position updates")
+    parser.add_argument("--output", default=TIMELINE, help="where to write the timeline")
+    args = parser.parse_args()
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone(args.time_zone))
+    epoch = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc)
+    loop = VirtualClockLoop(epoch=epoch)
+    started = time.perf_counter()
+    try:
+        house = House(loop, args.covers, seed=args.seed, overrides=parse_overrides(args.set))
+        house.hass.config.latitude = args.latitude
+        house.hass.config.longitude = args.longitude
+        timeline = loop.run_until_complete(simulate(house, args))
+        # Stop the weather request and the moves still running at the end of the last day
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    finally:
+        loop.close()
+    elapsed = time.perf_counter() - started
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        file.writelines(line + "\n" for line in timeline.lines)
+
+    print(f"{'cover':>16} {'relay cmds':>11} {'opened':>7} {'closed':>7}")
+    for entity_id, counts in sorted(timeline.summary().items()):
+        print(f"{entity_id:>16} {counts['relay']:>11} {counts['opening']:>7} {counts['closing']:>7}")
+    print(
+        f"\n{args.days} days of {args.covers} covers simulated in {elapsed:.1f} s, "
+        f"{len(timeline.lines)} events written to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
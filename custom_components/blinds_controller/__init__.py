@@ -1,25 +1,128 @@
+import logging
+
 # Import necessary modules from Home Assistant
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
 
 # Import the domain constant from the current package
-from .const import DOMAIN
+from .const import (
+    CONF_MOTOR_LIMITS, CONF_SCHEDULE_SPREAD, CONF_WEATHER_URL, DATA_STATS, DATA_WEATHER_URL, DOMAIN,
+    SERVICE_MOVE_GROUP,
+)
+from .batch import (
+    BATCHES_SCHEMA, CONF_BATCHES, CONF_COVERS, CONF_CSV, CONF_NAME, batch_unique_id, cover_configs,
+    is_batch, parse_csv,
+)
+from .group import MOVE_GROUP_SCHEMA, async_handle_move_group
+from .journal import async_get_travel_journal
+from .motors import async_get_motor_scheduler
+from .scheduler import async_get_schedule_engine
+
+_LOGGER = logging.getLogger(__name__)
+
+# The cover and its diagnostic sensors
+PLATFORMS = ["cover", "sensor"]
+
+# Covers are set up from the config flow, YAML holds integration wide options
+# and batches of covers imported as one config entry each (see batch.py)
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                # Point the weather protection to another Open-Meteo compatible server (e.g. a local test server)
+                vol.Optional(CONF_WEATHER_URL): cv.url,
+                vol.Optional(CONF_BATCHES): BATCHES_SCHEMA,
+                # Relay group -> maximum number of motors running at once
+                vol.Optional(CONF_MOTOR_LIMITS): {cv.string: vol.All(vol.Coerce(int), vol.Range(min=1))},
+                # Window the scheduled actions of the covers are spread over, 0 fires them together
+                vol.Optional(CONF_SCHEDULE_SPREAD): cv.positive_time_period,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 async def async_setup(hass: HomeAssistant, config: dict):
+    if CONF_WEATHER_URL in config.get(DOMAIN, {}):
+        hass.data[DATA_WEATHER_URL] = config[DOMAIN][CONF_WEATHER_URL]
+    async_get_motor_scheduler(hass).limits = dict(config.get(DOMAIN, {}).get(CONF_MOTOR_LIMITS, {}))
+    if CONF_SCHEDULE_SPREAD in config.get(DOMAIN, {}):
+        async_get_schedule_engine(hass).spread = config[DOMAIN][CONF_SCHEDULE_SPREAD]
+
+    # Move many covers with a few multi-entity relay service calls
+    async def handle_move_group(call):
+        await async_handle_move_group(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_MOVE_GROUP, handle_move_group, schema=MOVE_GROUP_SCHEMA)
+
+    batches = config.get(DOMAIN, {}).get(CONF_BATCHES, [])
+    for batch in batches:
+        batch = dict(batch)
+        if CONF_CSV in batch:
+            path = batch.pop(CONF_CSV)
+            try:
+                batch[CONF_COVERS] = await hass.async_add_executor_job(_read_csv, path)
+            except (OSError, vol.Invalid) as err:
+                # The other batches and the covers of the config flow still load,
+                # the entry of this batch keeps its covers until the file is fixed
+                _LOGGER.error("Batch %s: invalid covers file %s: %s", batch[CONF_NAME], path, err)
+                continue
+        hass.async_create_task(
+            hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_IMPORT}, data=batch)
+        )
+
+    # A batch renamed or removed from YAML would keep driving its relays
+    unique_ids = {batch_unique_id(batch[CONF_NAME]) for batch in batches}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.source == SOURCE_IMPORT and is_batch(entry.data) and entry.unique_id not in unique_ids:
+            _LOGGER.warning("Removing batch %s, it is no longer in configuration.yaml", entry.title)
+            hass.async_create_task(hass.config_entries.async_remove(entry.entry_id))
     # Return True here and the user will be able to initiate the config flow from the integrations page
     return True
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry):
+    # Version 1 compared the timed control times with the UTC clock, the existing
+    # covers keep their UTC times, new ones are set in local time
+    if entry.version == 1:
+        data = dict(entry.data)
+        if not is_batch(data):
+            data.setdefault("timed_control_utc", True)
+        hass.config_entries.async_update_entry(entry, data=data, version=2)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Set up your integration with the configuration entry
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = entry.data
-    # Load the cover platform with the configuration entry
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setup(entry, "cover")
-    )
+    # Reload the entry when the options change, so the covers recompile their schedules
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    # Load the platforms with the configuration entry, the covers do not wait for
+    # their relays and sensors, so this never blocks on the load order
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    # Reload the configuration entry after it was updated from the options flow
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Unload your integration when the configuration entry is removed
-    await hass.config_entries.async_forward_entry_unload(entry, "cover")
-    hass.data[DOMAIN].pop(entry.entry_id)
-    return True
\ No newline at end of file
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id)
+        for device_id, _, _ in cover_configs(entry):
+            hass.data.get(DATA_STATS, {}).pop(device_id, None)
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    # Forget the travel journal of a deleted cover
+    journal = async_get_travel_journal(hass)
+    await journal.async_load()
+    for device_id, _, _ in cover_configs(entry):
+        journal.async_remove(device_id)
+
+
+def _read_csv(path):
+    with open(path, encoding="utf-8") as file:
+        return parse_csv(file.read())
@@ -0,0 +1,202 @@
+"""
+Module batch lets one config entry define many covers.
+
+A batch entry is imported from YAML. Its covers are listed inline or read from a CSV
+file with a header row (name, entity_up, entity_down, time_up, time_down and optionally
+any other option as a column). The options of the batch (schedules, weather protection,
+...) are shared by all its covers, a cover may still override them. Times of day are
+quoted, unknown options are rejected:
+
+    blinds_controller:
+      batches:
+        - name: Ground floor
+          delay_control: true
+          timed_control_down: true
+          time_to_roll_down: "22:00"
+          protect_the_blinds: true
+          csv: /config/blinds_ground_floor.csv
+        - name: Attic
+          covers:
+            - name: Attic east
+              entity_up: switch.attic_east_up
+              entity_down: switch.attic_east_down
+              time_up: 25
+              time_down: 23
+
+The entry of a batch is found again by its name, the names of the batches must stay
+unique once slugified. A batch removed or renamed in YAML has its entry removed.
+Entries created from the config flow keep holding a single cover.
+"""
+import csv
+from datetime import datetime
+import io
+
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import slugify
+import voluptuous as vol
+
+from .const import RELAY_DOMAINS
+
+CONF_BATCHES = "batches"
+CONF_COVERS = "covers"
+CONF_CSV = "csv"
+CONF_NAME = "name"
+
+# Options of a cover not given by the batch, same defaults as the config flow
+COVER_DEFAULTS = {
+    "tilt_open": 0.0,
+    "tilt_closed": 0.0,
+    "timed_control_down": False,
+    "time_to_roll_down": "12:00",
+    "timed_control_up": False,
+    "time_to_roll_up": "12:00",
+    "timed_control_utc": False,
+    "delay_control": False,
+    "delay_sunrise": 0,
+    "delay_sunset": 0,
+    "night_lights": False,
+    "entity_night_lights": None,
+    "tilting_day": False,
+    "protect_the_blinds": False,
+    "wind_speed": 30,
+    "wmo_code": 80,
+    "netamo_enable": False,
+    "netamo_speed_entity": None,
+    "netamo_speed": 30,
+    "netamo_gust_entity": None,
+    "netamo_gust": 40,
+    "netamo_rain_entity": None,
+    "netamo_rain": 40,
+    "send_stop_at_end": True,
+}
+
+_TIME = vol.All(vol.Coerce(float), vol.Range(min=0))
+_RELAY = vol.All(cv.entity_id, cv.entity_domain(RELAY_DOMAINS))
+_SENSOR = vol.All(cv.entity_id, cv.entity_domain("sensor"))
+
+
+def _time_of_day(value):
+    """Validate a HH:MM time of day, kept as the text the covers parse."""
+    if not isinstance(value, str):
+        # YAML reads an unquoted 22:00 as the number 1320
+        raise vol.Invalid("the time of day must be quoted, e.g. '22:00'")
+    value = value.strip()
+    try:
+        datetime.strptime(value, "%H:%M")
+    except ValueError as err:
+        raise vol.Invalid(f"invalid time of day {value}, expected HH:MM") from err
+    return value
+
+
+# Options a batch shares with its covers and a cover may override, validated like the
+# config flow does. CSV cells are text, the validators convert them ("false" -> False)
+COVER_OPTIONS = {
+    vol.Optional("tilt_open"): _TIME,
+    vol.Optional("tilt_closed"): _TIME,
+    vol.Optional("timed_control_down"): cv.boolean,
+    vol.Optional("time_to_roll_down"): _time_of_day,
+    vol.Optional("timed_control_up"): cv.boolean,
+    vol.Optional("time_to_roll_up"): _time_of_day,
+    vol.Optional("timed_control_utc"): cv.boolean,
+    vol.Optional("delay_control"): cv.boolean,
+    vol.Optional("delay_sunrise"): vol.Coerce(int),
+    vol.Optional("delay_sunset"): vol.Coerce(int),
+    vol.Optional("night_lights"): cv.boolean,
+    vol.Optional("entity_night_lights"): vol.Maybe(_RELAY),
+    vol.Optional("tilting_day"): cv.boolean,
+    vol.Optional("protect_the_blinds"): cv.boolean,
+    vol.Optional("wind_speed"): vol.Coerce(float),
+    vol.Optional("wmo_code"): vol.Coerce(int),
+    vol.Optional("netamo_enable"): cv.boolean,
+    vol.Optional("netamo_speed_entity"): vol.Maybe(_SENSOR),
+    vol.Optional("netamo_speed"): vol.Coerce(float),
+    vol.Optional("netamo_gust_entity"): vol.Maybe(_SENSOR),
+    vol.Optional("netamo_gust"): vol.Coerce(float),
+    vol.Optional("netamo_rain_entity"): vol.Maybe(_SENSOR),
+    vol.Optional("netamo_rain"): vol.Coerce(float),
+    vol.Optional("netamo_hysteresis"): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+    vol.Optional("netamo_hold_time"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("send_stop_at_end"): cv.boolean,
+    vol.Optional("command_window"): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+    vol.Optional("publish_step"): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    vol.Optional("publish_max_rate"): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+    vol.Optional("attributes_in_diagnostics_only"): cv.boolean,
+    vol.Optional("motor_group"): cv.string,
+}
+
+# Unknown options are rejected, a typo would otherwise be silently ignored
+BATCH_COVER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Required("entity_up"): _RELAY,
+        vol.Required("entity_down"): _RELAY,
+        vol.Required("time_up"): _TIME,
+        vol.Required("time_down"): _TIME,
+        **COVER_OPTIONS,
+    }
+)
+
+
+def _unique_names(covers):
+    slugs = [slugify(cover[CONF_NAME]) for cover in covers]
+    if len(set(slugs)) != len(slugs):
+        raise vol.Invalid("cover names of a batch must be unique")
+    return covers
+
+
+BATCH_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_NAME): cv.string,
+            vol.Exclusive(CONF_COVERS, "covers"): vol.All(
+                [BATCH_COVER_SCHEMA], vol.Length(min=1), _unique_names
+            ),
+            vol.Exclusive(CONF_CSV, "covers"): cv.isfile,
+            **COVER_OPTIONS,
+        }
+    ),
+    cv.has_at_least_one_key(CONF_COVERS, CONF_CSV),
+)
+
+
+def _unique_batch_names(batches):
+    # "Living Room" and "living_room" would be imported into the same entry
+    unique_ids = [batch_unique_id(batch[CONF_NAME]) for batch in batches]
+    if len(set(unique_ids)) != len(unique_ids):
+        raise vol.Invalid("batch names must be unique, also in lowercase with spaces as _")
+    return batches
+
+
+BATCHES_SCHEMA = vol.All([BATCH_SCHEMA], _unique_batch_names)
+
+
+def batch_unique_id(name):
+    """Return the unique id of the config entry the batch is imported into."""
+    return f"batch_{slugify(name)}"
+
+
+def parse_csv(text):
+    """Return the validated covers of a CSV text, empty cells are left out."""
+    rows = csv.DictReader(io.StringIO(text))
+    covers = [
+        BATCH_COVER_SCHEMA({key.strip(): value.strip() for key, value in row.items() if key and value})
+        for row in rows
+    ]
+    return _unique_names(covers)
+
+
+def is_batch(data):
+    """Return if the config entry data defines a batch of covers."""
+    return CONF_COVERS in data
+
+
+def cover_configs(entry):
+    """Return (device_id, name, data) of every cover of the config entry."""
+    if not is_batch(entry.data):
+        return [(entry.entry_id, entry.title, entry.data)]
+    shared = {key: value for key, value in entry.data.items() if key != CONF_COVERS}
+    configs = []
+    for cover in entry.data[CONF_COVERS]:
+        data = {**COVER_DEFAULTS, **shared, **cover, "ent_name": cover[CONF_NAME]}
+        configs.append((f"{entry.entry_id}_{slugify(cover[CONF_NAME])}", cover[CONF_NAME], data))
+    return configs
@@ -8,10 +8,27 @@ E.g.:
 * At time 10 TravelCalculator will return position 80 (final position not reached).
 * At time 20 TravelCalculator will return position 70 (final position not reached).
 * At time 30 TravelCalculator will return position 60 (final position reached).
+
+The calculators of the covers share a TravelCalculatorBank, one row per calculator in
+contiguous arrays, which computes the positions of all of them in one vectorized pass
+(NumPy is used when it is installed, plain lists otherwise). A TravelCalculator keeps its
+own state as plain Python values and writes every change through to its row, so single
+position queries never touch the arrays. A calculator used on its own has no bank.
+
+Positions are kept as floats and only rounded when returned by current_position(). Time
+comes from a clock object, time.monotonic() by default, so corrections of the wall clock
+do not affect a cover while it travels. Tests pass a ManualClock instead.
 """
+import math
+from operator import attrgetter
 import time
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - the bank falls back to lists
+    np = None
+
 
 class PositionType(Enum):
     """Enum class for different type of calculated positions."""
@@ -29,16 +46,256 @@ class TravelStatus(Enum):
     STOPPED = 3
 
 
+class MonotonicClock:
+    """Clock of the calculators, immune to wall clock corrections."""
+
+    __slots__ = ()
+
+    def time(self):
+        """Return the current time in seconds."""
+        return time.monotonic()
+
+
+class ManualClock:
+    """Clock set by hand, used within unit tests and simulations."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now=0.0):
+        """Initialize ManualClock class."""
+        self.now = now
+
+    def time(self):
+        """Return the time set last."""
+        return self.now
+
+    def advance(self, seconds):
+        """Move the clock forward."""
+        self.now += seconds
+
+
+_POSITION_TYPES = {member.value: member for member in PositionType}
+_TRAVEL_STATUSES = {member.value: member for member in TravelStatus}
+
+_UP = TravelStatus.DIRECTION_UP.value
+_DOWN = TravelStatus.DIRECTION_DOWN.value
+_STOPPED = TravelStatus.STOPPED.value
+_CALCULATED = PositionType.CALCULATED.value
+
+# Row fields of the bank and their array types, enums are stored by value.
+# The speeds in percent per second are derived from the travel times and the range.
+_BANK_FIELDS = {
+    "position_type": "i1",
+    "last_known_position": "f8",
+    "travel_time_down": "f8",
+    "travel_time_up": "f8",
+    "travel_to_position": "f8",
+    "travel_started_time": "f8",
+    "travel_direction": "i1",
+    "position_closed": "f8",
+    "position_open": "f8",
+    "speed_down": "f8",
+    "speed_up": "f8",
+}
+
+# Fields describing a calculator, the speeds follow from them
+_STATE_FIELDS = tuple(name for name in _BANK_FIELDS if not name.startswith("speed_"))
+
+
+class TravelCalculatorBank:
+    """Class storing many travel calculators in arrays, one row per calculator."""
+
+    __slots__ = (
+        "clock", "capacity", "arrays", "_free_rows", "_rows_used",
+        "computed_time", "positions", "reached",
+    )
+
+    def __init__(self, capacity=16, clock=None):
+        """Initialize TravelCalculatorBank class."""
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.capacity = 0
+        self.arrays = {name: self._new_array(kind, 0) for name, kind in _BANK_FIELDS.items()}
+        self._free_rows = []
+        self._rows_used = 0
+        self._grow(max(1, capacity))
+        # Results of the last compute() pass
+        self.computed_time = None
+        self.positions = self._new_array("f8", self.capacity)
+        self.reached = self._new_array("?", self.capacity)
+
+    @staticmethod
+    def _new_array(kind, size):
+        if np is not None:
+            return np.zeros(size, dtype=kind)
+        return [False if kind == "?" else 0] * size
+
+    def _grow(self, capacity):
+        for name, kind in _BANK_FIELDS.items():
+            array = self._new_array(kind, capacity)
+            array[:self.capacity] = self.arrays[name][:self.capacity]
+            self.arrays[name] = array
+        self.capacity = capacity
+
+    def allocate(self):
+        """Return a free row."""
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._rows_used == self.capacity:
+            self._grow(self.capacity * 2)
+        row = self._rows_used
+        self._rows_used += 1
+        return row
+
+    def release(self, row):
+        """Return the row to the bank, it is reused by the next calculator."""
+        for name in _BANK_FIELDS:
+            self.arrays[name][row] = 0
+        self._free_rows.append(row)
+
+    def __len__(self):
+        """Return the number of rows in use."""
+        return self._rows_used - len(self._free_rows)
+
+    def compute(self, now=None):
+        """Compute the positions and reached flags of all rows, at the clock time by default."""
+        if now is None:
+            now = self.clock.time()
+        self.computed_time = now
+        if len(self.positions) < self.capacity:
+            self.positions = self._new_array("f8", self.capacity)
+            self.reached = self._new_array("?", self.capacity)
+        if np is None:
+            self._compute_rows(now)
+            return
+        used = self._rows_used
+        a = {name: array[:used] for name, array in self.arrays.items()}
+        last = a["last_known_position"]
+        target = a["travel_to_position"]
+        relative = target - last
+        up = a["travel_direction"] == _UP
+        down = a["travel_direction"] == _DOWN
+        reached_or_exceeded = ((relative >= 0) & down) | ((relative <= 0) & up)
+        speed = np.where(relative > 0, a["speed_up"], a["speed_down"])
+        elapsed = now - a["travel_started_time"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            arrived = reached_or_exceeded | (now >= a["travel_started_time"] + np.abs(relative) / speed)
+            position = np.where(arrived, target, last + np.sign(relative) * speed * elapsed)
+        position = np.where(a["position_type"] == _CALCULATED, position, last)
+        self.positions[:used] = position
+        self.reached[:used] = position == target
+
+    def _compute_rows(self, now):
+        a = self.arrays
+        for row in range(self._rows_used):
+            last = a["last_known_position"][row]
+            target = a["travel_to_position"][row]
+            position = last
+            if a["position_type"][row] == _CALCULATED:
+                position = _calculate_position(
+                    last, target, a["travel_direction"][row], a["travel_started_time"][row],
+                    a["speed_up"][row], a["speed_down"][row], now,
+                )
+            self.positions[row] = position
+            self.reached[row] = position == target
+
+
+def _speed(travel_time, travel_range):
+    """Return the speed in percent per second, covers without travel time arrive at once."""
+    return travel_range / travel_time if travel_time else math.inf
+
+
+def _position_reached_or_exceeded(relative_position, travel_direction):
+    """Return if designated position was reached."""
+    if relative_position >= 0 and travel_direction == _DOWN:
+        return True
+    if relative_position <= 0 and travel_direction == _UP:
+        return True
+    return False
+
+
+def _calculate_position(last_known_position, travel_to_position, travel_direction,
+                        travel_started_time, speed_up, speed_down, now):
+    """Return the exact calculated position of one row."""
+    relative_position = travel_to_position - last_known_position
+
+    if _position_reached_or_exceeded(relative_position, travel_direction):
+        return travel_to_position
+
+    speed = speed_up if relative_position > 0 else speed_down
+    elapsed = now - travel_started_time
+    # Reached exactly at arrival_time(), timers scheduled for it see the target.
+    # Compared like arrival_time() computes it, now - started may be an ulp short
+    if now >= travel_started_time + abs(relative_position) / speed:
+        return travel_to_position
+    return last_known_position + math.copysign(speed * elapsed, relative_position)
+
+
+def _mirrored_field(name, members=None, updates_speeds=False):
+    """Return a property kept in a slot of the calculator and mirrored to its bank row.
+
+    Reads come from the slot as plain Python values, the bank row only follows the
+    writes for the vectorized compute().
+    """
+    slot = "_" + name
+
+    if members is not None:
+        def getter(self):
+            return members[getattr(self, slot)]
+    else:
+        getter = attrgetter(slot)
+
+    def setter(self, value):
+        if members is not None:
+            value = value.value
+        setattr(self, slot, value)
+        if self._bank is not None:
+            self._bank.arrays[name][self._row] = value
+        if updates_speeds:
+            self._update_speeds()
+
+    return property(getter, setter)
+
+
 class TravelCalculator:
     """Class for calculating the current position of a cover."""
 
-    # pylint: disable=too-many-instance-attributes
+    # The state is kept in slots as plain Python values (enums by value) and mirrored
+    # to a row of the bank, if the calculator has one
+    __slots__ = ("_bank", "_row", "_clock", "_speed_up", "_speed_down") + tuple(
+        "_" + name for name in _STATE_FIELDS
+    )
+
+    position_type = _mirrored_field("position_type", _POSITION_TYPES)
+    last_known_position = _mirrored_field("last_known_position")
+    travel_time_down = _mirrored_field("travel_time_down", updates_speeds=True)
+    travel_time_up = _mirrored_field("travel_time_up", updates_speeds=True)
+    travel_to_position = _mirrored_field("travel_to_position")
+    travel_started_time = _mirrored_field("travel_started_time")
+    travel_direction = _mirrored_field("travel_direction", _TRAVEL_STATUSES)
+    position_closed = _mirrored_field("position_closed", updates_speeds=True)
+    position_open = _mirrored_field("position_open", updates_speeds=True)
+
+    def __init__(self, travel_time_down, travel_time_up, bank=None, clock=None):
+        """Initialize TravelCalculator class.
+
+        A bank shared by many calculators may be given, the calculator then uses the clock
+        of the bank. A calculator on its own uses clock and needs no bank.
+        """
+        self._bank = bank
+        self._row = bank.allocate() if bank is not None else None
+        self._clock = None if bank is not None else (clock if clock is not None else MonotonicClock())
+        # Read by _update_speeds before the setters below gave them their values
+        self._travel_time_down = self._travel_time_up = 0
+        self._position_closed = 0
+        self._position_open = 100
 
-    def __init__(self, travel_time_down, travel_time_up):
-        """Initialize TravelCalculator class."""
         self.position_type = PositionType.UNKNOWN
         self.last_known_position = 0
 
+        # 0 is closed, 100 is fully open
+        self.position_closed = 0
+        self.position_open = 100
+
         self.travel_time_down = travel_time_down
         self.travel_time_up = travel_time_up
 
@@ -46,11 +303,19 @@ class TravelCalculator:
         self.travel_started_time = 0
         self.travel_direction = TravelStatus.STOPPED
 
-        # 0 is closed, 100 is fully open
-        self.position_closed = 0
-        self.position_open = 100
+    @property
+    def clock(self):
+        """Return the clock of the calculator."""
+        return self._clock if self._bank is None else self._bank.clock
 
-        self.time_set_from_outside = None
+    def _update_speeds(self):
+        """Precompute the speeds when the travel times or the range change."""
+        travel_range = self._position_open - self._position_closed
+        self._speed_up = _speed(self._travel_time_up, travel_range)
+        self._speed_down = _speed(self._travel_time_down, travel_range)
+        if self._bank is not None:
+            self._bank.arrays["speed_up"][self._row] = self._speed_up
+            self._bank.arrays["speed_down"][self._row] = self._speed_down
 
     def set_position(self, position):
         """Set known position of cover."""
@@ -60,13 +325,13 @@ class TravelCalculator:
 
     def stop(self):
         """Stop traveling."""
-        self.last_known_position = self.current_position()
-        self.travel_to_position = self.last_known_position
+        self.last_known_position = self.exact_position()
+        self.travel_to_position = self._last_known_position
         self.position_type = PositionType.CALCULATED
         self.travel_direction = TravelStatus.STOPPED
 
     def start_travel(self, travel_to_position):
-        """Start traveling to position."""
+        """Start traveling to position, return the time the position is reached."""
         self.stop()
         self.travel_started_time = self.current_time()
         self.travel_to_position = travel_to_position
@@ -74,84 +339,93 @@ class TravelCalculator:
 
         self.travel_direction = \
             TravelStatus.DIRECTION_UP \
-            if travel_to_position > self.last_known_position else \
+            if travel_to_position > self._last_known_position else \
             TravelStatus.DIRECTION_DOWN
 
+        return self.arrival_time()
+
     def start_travel_up(self):
         """Start traveling up."""
-        self.start_travel(self.position_open)
+        return self.start_travel(self._position_open)
 
     def start_travel_down(self):
         """Start traveling down."""
-        self.start_travel(self.position_closed)
+        return self.start_travel(self._position_closed)
+
+    def arrival_time(self):
+        """Return the time the designated position is reached, None if not traveling."""
+        if self._position_type != _CALCULATED or self._travel_direction == _STOPPED:
+            return None
+        relative_position = self._travel_to_position - self._last_known_position
+        if self._position_reached_or_exceeded(relative_position):
+            return self._travel_started_time
+        return self._travel_started_time + \
+            self._calculate_travel_time(relative_position)
+
+    def exact_position(self):
+        """Return current (calculated or known) position without rounding."""
+        if self._position_type != _CALCULATED:
+            return self._last_known_position
+        return _calculate_position(
+            self._last_known_position, self._travel_to_position, self._travel_direction,
+            self._travel_started_time, self._speed_up, self._speed_down, self.current_time(),
+        )
 
     def current_position(self):
         """Return current (calculated or known) position."""
-        if self.position_type == PositionType.CALCULATED:
-            return self._calculate_position()
-        return self.last_known_position
+        return round(self.exact_position())
 
     def is_traveling(self):
         """Return if cover is traveling."""
-        return self.current_position() != self.travel_to_position
+        return self.exact_position() != self._travel_to_position
 
     def position_reached(self):
         """Return if cover has reached designated position."""
-        return self.current_position() == self.travel_to_position
+        return self.exact_position() == self._travel_to_position
 
     def is_open(self):
         """Return if cover is (fully) open."""
-        return self.current_position() == self.position_open
+        return self.current_position() == self._position_open
 
     def is_closed(self):
         """Return if cover is (fully) closed."""
-        return self.current_position() == self.position_closed
-
-    def _calculate_position(self):
-        """Return calculated position."""
-        relative_position = self.travel_to_position - self.last_known_position
-
-        def position_reached_or_exceeded(relative_position):
-            """Return if designated position was reached."""
-            if relative_position >= 0 \
-                    and self.travel_direction == TravelStatus.DIRECTION_DOWN:
-                return True
-            if relative_position <= 0 \
-                    and self.travel_direction == TravelStatus.DIRECTION_UP:
-                return True
-            return False
-
-        if position_reached_or_exceeded(relative_position):
-            return self.travel_to_position
-
-        travel_time = self._calculate_travel_time(relative_position)
-        if self.current_time() > self.travel_started_time + travel_time:
-            return self.travel_to_position
-        progress = (self.current_time()-self.travel_started_time)/travel_time
-        position = self.last_known_position + relative_position * progress
-        return int(position)
+        return self.current_position() == self._position_closed
+
+    def _position_reached_or_exceeded(self, relative_position):
+        """Return if designated position was reached."""
+        return _position_reached_or_exceeded(relative_position, self._travel_direction)
+
+    def computed_position(self):
+        """Return the position from the last compute() pass of the bank."""
+        if self._bank is None:
+            return self.current_position()
+        return round(float(self._bank.positions[self._row]))
+
+    def computed_reached(self):
+        """Return if the position was reached in the last compute() pass of the bank."""
+        if self._bank is None:
+            return self.position_reached()
+        return bool(self._bank.reached[self._row])
+
+    def release(self):
+        """Give the row back to the bank, the calculator must not be used afterwards."""
+        if self._bank is not None:
+            self._bank.release(self._row)
 
     def _calculate_travel_time(self, relative_position):
         """Calculate time to travel to relative position."""
-        travel_direction = \
-            TravelStatus.DIRECTION_UP \
-            if relative_position > 0 else \
-            TravelStatus.DIRECTION_DOWN
-        travel_time_full = \
-            self.travel_time_up \
-            if travel_direction == TravelStatus.DIRECTION_UP else \
-            self.travel_time_down
-        travel_range = self.position_open - self.position_closed
-
-        return travel_time_full * abs(relative_position) / travel_range
+        speed = self._speed_up if relative_position > 0 else self._speed_down
+        return abs(relative_position) / speed
 
     def current_time(self):
-        """Get current time. May be modified from outside (for unit tests)."""
-        # time_set_from_outside is  used within unit tests
-        if self.time_set_from_outside is not None:
-            return self.time_set_from_outside
-        return time.time()
+        """Get current time from the clock."""
+        if self._bank is None:
+            return self._clock.time()
+        return self._bank.clock.time()
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in _STATE_FIELDS)
 
     def __eq__(self, other):
         """Equal operator."""
-        return self.__dict__ == other.__dict__
\ No newline at end of file
+        return self._fields() == other._fields()
@@ -1,98 +1,181 @@
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers import selector
 import voluptuous as vol
 import re
 
-from .const import DOMAIN
+from .batch import CONF_NAME, batch_unique_id, is_batch
+from .const import DOMAIN, RELAY_DOMAINS
 
+WIND_DEVICE_CLASSES = ["wind_speed"]
+RAIN_DEVICE_CLASSES = ["precipitation", "precipitation_intensity"]
 
-class BlindsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    VERSION = 1
-    CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
+RELAY_SELECTOR = selector.EntitySelector(selector.EntitySelectorConfig(domain=RELAY_DOMAINS))
+WIND_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="sensor", device_class=WIND_DEVICE_CLASSES)
+)
+RAIN_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="sensor", device_class=RAIN_DEVICE_CLASSES)
+)
+
+# Entity fields -> allowed domains and device classes (None accepts any)
+ENTITY_FIELDS = {
+    "entity_up": (RELAY_DOMAINS, None),
+    "entity_down": (RELAY_DOMAINS, None),
+    "entity_night_lights": (RELAY_DOMAINS, None),
+    "netamo_speed_entity": (["sensor"], WIND_DEVICE_CLASSES),
+    "netamo_gust_entity": (["sensor"], WIND_DEVICE_CLASSES),
+    "netamo_rain_entity": (["sensor"], RAIN_DEVICE_CLASSES),
+}
+# Left empty in the form, stored as None like before
+OPTIONAL_ENTITY_FIELDS = ("entity_night_lights", "netamo_speed_entity", "netamo_gust_entity", "netamo_rain_entity")
+
+
+class EntityValidationMixin:
+    """Validate the picked entities against an index built once per flow."""
+
+    _entity_index = None
 
     @callback
-    def _get_entity_ids(self):
-        return self.hass.states.async_entity_ids()
+    def _get_entity_index(self):
+        # entity_id -> device class, the selectors already do the filtering in the UI
+        if self._entity_index is None:
+            self._entity_index = {
+                state.entity_id: state.attributes.get("device_class")
+                for state in self.hass.states.async_all()
+            }
+        return self._entity_index
+
+    @callback
+    def _validate_entities(self, user_input):
+        """Fill the empty optional entities with None, return the errors per field."""
+        for field in OPTIONAL_ENTITY_FIELDS:
+            user_input.setdefault(field, None)
+        errors = {}
+        index = self._get_entity_index()
+        for field, (domains, device_classes) in ENTITY_FIELDS.items():
+            entity_id = user_input.get(field)
+            if entity_id is None:
+                continue
+            if entity_id.split(".", 1)[0] not in domains or entity_id not in index:
+                errors[field] = "invalid_entity"
+            elif device_classes is not None and index[entity_id] not in device_classes:
+                errors[field] = "invalid_device_class"
+        return errors
+
+
+class BlindsConfigFlow(EntityValidationMixin, config_entries.ConfigFlow, domain=DOMAIN):
+    VERSION = 2
+    CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
-            return self.async_create_entry(
-                title=user_input["ent_name"],
-                data=user_input,
-            )
+            errors = self._validate_entities(user_input)
+            if not errors:
+                return self.async_create_entry(
+                    title=user_input["ent_name"],
+                    data=user_input,
+                )
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema(
-                {
-                    vol.Required("ent_name"): str,
-                    vol.Required("entity_up", default=None): vol.In(self._get_entity_ids()),
-                    vol.Required("entity_down", default=None): vol.In(self._get_entity_ids()),
-                    vol.Required("time_up"): vol.All(vol.Coerce(float), vol.Range(min=0)),
-                    vol.Required("time_down"): vol.All(vol.Coerce(float), vol.Range(min=0)),
-                    vol.Required("tilt_open"): vol.All(vol.Coerce(float), vol.Range(min=0)),
-                    vol.Required("tilt_closed"): vol.All(vol.Coerce(float), vol.Range(min=0)),
-
-                    vol.Required("timed_control_down", default=False): bool,
-                    vol.Optional("time_to_roll_down", default = "12:00"): vol.All(vol.Coerce(str)),
-                    vol.Required("timed_control_up", default=False): bool,
-                    vol.Optional("time_to_roll_up", default = "12:00"): vol.All(vol.Coerce(str)),
-
-                    vol.Required("delay_control",default=False): bool,
-                    vol.Optional("delay_sunrise",default=0): vol.All(vol.Coerce(int)),
-                    vol.Optional("delay_sunset",default=0): vol.All(vol.Coerce(int)),
-
-                    vol.Required("night_lights",default=False): bool,
-                    vol.Optional("entity_night_lights", default=None): vol.Any(None, vol.In(self._get_entity_ids())),
-
-                    vol.Required("tilting_day", default=False): bool,
-
-                    vol.Required("protect_the_blinds", default=False): bool,
-                    vol.Optional("wind_speed", default=30): vol.All(vol.Coerce(float)),
-                    vol.Optional("wmo_code", default=80): vol.All(vol.Coerce(int)),
-
-                    vol.Required("netamo_enable", default=False): bool,
-                    vol.Optional("netamo_speed_entity", default=None): vol.Any(None, vol.In(self._get_entity_ids())),
-                    vol.Optional("netamo_speed", default=30): vol.All(vol.Coerce(float)),
-                    vol.Optional("netamo_gust_entity", default=None): vol.Any(None, vol.In(self._get_entity_ids())),
-                    vol.Optional("netamo_gust", default=40): vol.All(vol.Coerce(float)),
-                    vol.Optional("netamo_rain_entity", default=None): vol.Any(None, vol.In(self._get_entity_ids())),
-                    vol.Optional("netamo_rain", default=40): vol.All(vol.Coerce(float)),
-
-
-                    vol.Required("send_stop_at_end", default=True): bool
-                }
-            ),
+            data_schema=self.add_suggested_values_to_schema(self._user_schema(), user_input),
             errors=errors,
         )
 
+    # A batch of covers from YAML, updated on every start while it stays in YAML
+    async def async_step_import(self, batch):
+        data = {"ent_name": batch[CONF_NAME], **{key: value for key, value in batch.items() if key != CONF_NAME}}
+        await self.async_set_unique_id(batch_unique_id(batch[CONF_NAME]))
+        self._abort_if_unique_id_configured(updates=data)
+        return self.async_create_entry(title=batch[CONF_NAME], data=data)
+
+    @staticmethod
+    def _user_schema():
+        return vol.Schema(
+            {
+                vol.Required("ent_name"): str,
+                vol.Required("entity_up"): RELAY_SELECTOR,
+                vol.Required("entity_down"): RELAY_SELECTOR,
+                vol.Required("time_up"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("time_down"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("tilt_open"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("tilt_closed"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+
+                vol.Required("timed_control_down", default=False): bool,
+                vol.Optional("time_to_roll_down", default = "12:00"): vol.All(vol.Coerce(str)),
+                vol.Required("timed_control_up", default=False): bool,
+                vol.Optional("time_to_roll_up", default = "12:00"): vol.All(vol.Coerce(str)),
+                vol.Required("timed_control_utc", default=False): bool,
+
+                vol.Required("delay_control",default=False): bool,
+                vol.Optional("delay_sunrise",default=0): vol.All(vol.Coerce(int)),
+                vol.Optional("delay_sunset",default=0): vol.All(vol.Coerce(int)),
+
+                vol.Required("night_lights",default=False): bool,
+                vol.Optional("entity_night_lights"): RELAY_SELECTOR,
+
+                vol.Required("tilting_day", default=False): bool,
+
+                vol.Required("protect_the_blinds", default=False): bool,
+                vol.Optional("wind_speed", default=30): vol.All(vol.Coerce(float)),
+                vol.Optional("wmo_code", default=80): vol.All(vol.Coerce(int)),
+
+                vol.Required("netamo_enable", default=False): bool,
+                vol.Optional("netamo_speed_entity"): WIND_SELECTOR,
+                vol.Optional("netamo_speed", default=30): vol.All(vol.Coerce(float)),
+                vol.Optional("netamo_gust_entity"): WIND_SELECTOR,
+                vol.Optional("netamo_gust", default=40): vol.All(vol.Coerce(float)),
+                vol.Optional("netamo_rain_entity"): RAIN_SELECTOR,
+                vol.Optional("netamo_rain", default=40): vol.All(vol.Coerce(float)),
+                vol.Optional("netamo_hysteresis", default=10): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional("netamo_hold_time", default=300): vol.All(vol.Coerce(int), vol.Range(min=0)),
+
+
+                vol.Required("send_stop_at_end", default=True): bool,
+                vol.Optional("command_window", default=0.3): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Optional("publish_step", default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional("publish_max_rate", default=2.0): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                vol.Optional("attributes_in_diagnostics_only", default=False): bool,
+                vol.Optional("motor_group"): str,
+            }
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
         return BlindsOptionsFlow(config_entry)
 
-class BlindsOptionsFlow(config_entries.OptionsFlow):
+class BlindsOptionsFlow(EntityValidationMixin, config_entries.OptionsFlow):
     def __init__(self, config_entry):
         self.config_entry = config_entry
 
     @callback
-    def _get_entity_ids(self):
-        return self.hass.states.async_entity_ids()
+    def _suggested(self, field):
+        return {"suggested_value": self.config_entry.data.get(field)}
 
     async def async_step_init(self, user_input=None):
+        if is_batch(self.config_entry.data):
+            return self.async_abort(reason="batch_in_yaml")
+        errors = {}
         if user_input is not None:
-            updated_data = dict(self.config_entry.data)
-            updated_data.update(user_input)
-            self.hass.config_entries.async_update_entry(entry=self.config_entry, data=updated_data)
-            return self.async_create_entry(title="", data={})
+            errors = self._validate_entities(user_input)
+            # A cleared motor group leaves the group
+            user_input.setdefault("motor_group", None)
+            if not errors:
+                updated_data = dict(self.config_entry.data)
+                updated_data.update(user_input)
+                self.hass.config_entries.async_update_entry(entry=self.config_entry, data=updated_data)
+                return self.async_create_entry(title="", data={})
 
         return self.async_show_form(
+            errors=errors,
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required("ent_name", default=self.config_entry.data.get("ent_name", "")): str,
-                    vol.Required("entity_up", default=self.config_entry.data.get("entity_up", "")): vol.In(self._get_entity_ids()),
-                    vol.Required("entity_down", default=self.config_entry.data.get("entity_down", "")): vol.In(self._get_entity_ids()),
+                    vol.Required("entity_up", description=self._suggested("entity_up")): RELAY_SELECTOR,
+                    vol.Required("entity_down", description=self._suggested("entity_down")): RELAY_SELECTOR,
                     vol.Required("time_up", default=self.config_entry.data.get("time_up", 0.0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Required("time_down", default=self.config_entry.data.get("time_down", 0.0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Required("tilt_open", default=self.config_entry.data.get("tilt_open", 0.0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
@@ -102,13 +185,14 @@ class BlindsOptionsFlow(config_entries.OptionsFlow):
                     vol.Optional("time_to_roll_down", default=self.config_entry.data.get("time_to_roll_down", "")) : vol.All(vol.Coerce(str)),
                     vol.Required("timed_control_up", default=self.config_entry.data.get("timed_control_up")): bool,
                     vol.Optional("time_to_roll_up", default=self.config_entry.data.get("time_to_roll_up", "")) : vol.All(vol.Coerce(str)),
+                    vol.Required("timed_control_utc", default=self.config_entry.data.get("timed_control_utc", False)): bool,
 
                     vol.Required("delay_control", default=self.config_entry.data.get("delay_control")): bool, 
                     vol.Optional("delay_sunrise", default=self.config_entry.data.get("delay_sunrise", 0)): vol.All(vol.Coerce(int)),
                     vol.Optional("delay_sunset", default=self.config_entry.data.get("delay_sunset", 0)): vol.All(vol.Coerce(int)),
 
                     vol.Required("night_lights", default=self.config_entry.data.get("night_lights")): bool, 
-                    vol.Optional("entity_night_lights", default=self.config_entry.data.get("entity_night_lights")) : vol.Any(None, vol.In(self._get_entity_ids())),
+                    vol.Optional("entity_night_lights", description=self._suggested("entity_night_lights")): RELAY_SELECTOR,
 
                     vol.Required("tilting_day", default=self.config_entry.data.get("tilting_day")): bool,
 
@@ -117,14 +201,21 @@ class BlindsOptionsFlow(config_entries.OptionsFlow):
                     vol.Optional("wmo_code", default=self.config_entry.data.get("wmo_code")): vol.All(vol.Coerce(int)),
 
                     vol.Required("netamo_enable", default=self.config_entry.data.get("netamo_enable")): bool,
-                    vol.Optional("netamo_speed_entity", default=self.config_entry.data.get("netamo_speed_entity")): vol.Any(None, vol.In(self._get_entity_ids())),
+                    vol.Optional("netamo_speed_entity", description=self._suggested("netamo_speed_entity")): WIND_SELECTOR,
                     vol.Optional("netamo_speed", default=self.config_entry.data.get("netamo_speed")): vol.All(vol.Coerce(float)),
-                    vol.Optional("netamo_gust_entity", default=self.config_entry.data.get("netamo_gust_entity")): vol.Any(None, vol.In(self._get_entity_ids())),
+                    vol.Optional("netamo_gust_entity", description=self._suggested("netamo_gust_entity")): WIND_SELECTOR,
                     vol.Optional("netamo_gust", default=self.config_entry.data.get("netamo_gust")): vol.All(vol.Coerce(float)),
-                    vol.Optional("netamo_rain_entity", default=self.config_entry.data.get("netamo_rain_entity")): vol.Any(None, vol.In(self._get_entity_ids())),
+                    vol.Optional("netamo_rain_entity", description=self._suggested("netamo_rain_entity")): RAIN_SELECTOR,
                     vol.Optional("netamo_rain", default=self.config_entry.data.get("netamo_rain")): vol.All(vol.Coerce(float)),
+                    vol.Optional("netamo_hysteresis", default=self.config_entry.data.get("netamo_hysteresis", 10)): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                    vol.Optional("netamo_hold_time", default=self.config_entry.data.get("netamo_hold_time", 300)): vol.All(vol.Coerce(int), vol.Range(min=0)),
 
                     vol.Required("send_stop_at_end", default=self.config_entry.data.get("send_stop_at_end")): bool,
+                    vol.Optional("command_window", default=self.config_entry.data.get("command_window", 0.3)): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Optional("publish_step", default=self.config_entry.data.get("publish_step", 1)): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                    vol.Optional("publish_max_rate", default=self.config_entry.data.get("publish_max_rate", 2.0)): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                    vol.Optional("attributes_in_diagnostics_only", default=self.config_entry.data.get("attributes_in_diagnostics_only", False)): bool,
+                    vol.Optional("motor_group", description=self._suggested("motor_group")): str,
                 }
             ),
         )
@@ -1,3 +1,36 @@
 # const.py
 
 DOMAIN = "blinds_controller"
+
+# Entities able to drive the relays, also used for the night lights entity
+RELAY_DOMAINS = ["switch", "input_boolean", "light"]
+
+# Keys of the objects shared by all covers in hass.data
+DATA_DISPATCHER = f"{DOMAIN}_dispatcher"
+DATA_MOTION_TICKER = f"{DOMAIN}_motion_ticker"
+DATA_SCHEDULE_ENGINE = f"{DOMAIN}_schedule_engine"
+DATA_SUN_TIMES = f"{DOMAIN}_sun_times"
+DATA_MOTOR_SCHEDULER = f"{DOMAIN}_motor_scheduler"
+DATA_RELAY_CACHE = f"{DOMAIN}_relay_cache"
+
+# Sun sensors providing the next dawn and dusk
+SUN_NEXT_DAWN_ENTITY = "sensor.sun_next_dawn"
+SUN_NEXT_DUSK_ENTITY = "sensor.sun_next_dusk"
+DATA_WEATHER = f"{DOMAIN}_weather"
+DATA_WEATHER_URL = f"{DOMAIN}_weather_url"
+
+# YAML options of the integration
+CONF_WEATHER_URL = "weather_url"
+CONF_MOTOR_LIMITS = "motor_limits"
+CONF_SCHEDULE_SPREAD = "schedule_spread"
+DATA_COVERS = f"{DOMAIN}_covers"
+
+# Runtime counters of the covers, keyed by config entry
+DATA_STATS = f"{DOMAIN}_stats"
+
+# Travel journal of the covers, kept in .storage across restarts
+DATA_JOURNAL = f"{DOMAIN}_journal"
+JOURNAL_STORAGE_KEY = f"{DOMAIN}.journal"
+
+# Integration services
+SERVICE_MOVE_GROUP = "move_group"
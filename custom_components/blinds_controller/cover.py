@@ -14,21 +14,22 @@ from homeassistant.const import (
     SERVICE_CLOSE_COVER,
     SERVICE_OPEN_COVER,
     SERVICE_STOP_COVER,
+    STATE_UNAVAILABLE,
 )
 from homeassistant.helpers import entity_platform
 from homeassistant.core import callback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
 
 # Import the logger and datetime modules
 import logging
-from datetime import datetime, timedelta, timezone
+from collections import namedtuple
+from datetime import datetime, timedelta
 import asyncio
-import urllib.request
-import json
+import time
 
 
 # Import the TravelCalculator and TravelStatus classes from the calculator module
@@ -38,7 +39,20 @@ from .calculator import TravelCalculator
 from .calculator import TravelStatus
 
 # Import the domain constant from the current package
-from .const import DOMAIN
+from .const import DATA_COVERS, DOMAIN
+from .dispatcher import async_get_dispatcher
+from .ticker import async_get_motion_ticker
+from .scheduler import async_get_schedule_engine, next_sun_event, next_time_of_day
+from .sun import async_get_sun_times
+from .weather import async_get_weather_coordinator
+from .protection import ThresholdMonitor, parse_reading
+from .pipeline import CommandPipeline
+from .relays import SERVICE_STATES, async_get_relay_cache
+from .motors import PRIORITY_PROTECTION, PRIORITY_SCHEDULE, PRIORITY_USER, async_get_motor_scheduler
+from .journal import async_get_travel_journal, resume_segment, travel_segment
+from .publisher import DEFAULT_MAX_RATE, DEFAULT_STEP, MotionPublisher
+from .batch import cover_configs
+from .stats import async_get_cover_stats, timed
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,64 +73,118 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
     )
 
 # This function is called by Home Assistant to setup the component
+# An entry holds one cover, or a batch of covers imported from YAML
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
-    name = entry.title 
-    device_id = entry.entry_id 
-    async_add_entities([BlindsCover(hass, entry, name, device_id)])
+    async_add_entities(
+        BlindsCover(hass, entry, name, device_id, data)
+        for device_id, name, data in cover_configs(entry)
+    )
+
+
+# Position, tilt and motion flags of a cover at one moment, shared by all the
+# properties read during one state write
+MotionSnapshot = namedtuple(
+    "MotionSnapshot", ("position", "tilt_position", "is_closed", "is_opening", "is_closing")
+)
 
 
 # This class represents a cover entity in Home Assistant
 class BlindsCover(CoverEntity, RestoreEntity):
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, name, device_id):
+    # The configuration shown as attributes does not change between writes,
+    # the recorder does not need to store it with every position
+    _unrecorded_attributes = frozenset(
+        {"entity_up", "entity_down", "time_up", "time_down", "tilt_open", "tilt_closed"}
+    )
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, name, device_id, data=None):
+        # The options of the cover, the entry data unless it is part of a batch
+        if data is None:
+            data = entry.data
         self.hass = hass    # The Home Assistant instance
         self.entry = entry  # The configuration entry
+        self.stats = async_get_cover_stats(hass, device_id)  # Runtime counters
         self._state = None  # Initialize _state attribute
-        self._available = True  # Initialize _available attribute  
+        self._available = False  # Set once the relays are loaded, see async_added_to_hass
+        self._pending_resume = None  # Journal record resumed once the relays are loaded
 
-        self._travel_time_down = entry.data["time_down"]
-        self._travel_time_up = entry.data["time_up"]
-        self._travel_tilt_closed = entry.data["tilt_closed"]
-        self._travel_tilt_open = entry.data["tilt_open"]
-        self._up_switch_entity_id = entry.data["entity_up"]
-        self._down_switch_entity_id = entry.data["entity_down"]
+        self._travel_time_down = data["time_down"]
+        self._travel_time_up = data["time_up"]
+        self._travel_tilt_closed = data["tilt_closed"]
+        self._travel_tilt_open = data["tilt_open"]
+        self._up_switch_entity_id = data["entity_up"]
+        self._down_switch_entity_id = data["entity_down"]
 
         # Add ons
-        self._timed_control_down = entry.data["timed_control_down"]
-        self._time_to_roll_up = entry.data["time_to_roll_up"]
-        self._timed_control_up = entry.data["timed_control_up"]
-        self._time_to_roll_down = entry.data["time_to_roll_down"]
-        self._delay_control = entry.data["delay_control"]
-        self._delay_sunrise = entry.data["delay_sunrise"]
-        self._delay_sunset = entry.data["delay_sunset"]
-        self._night_lights = entry.data["night_lights"]
-        self._entity_night_lights = entry.data["entity_night_lights"]
-        self._tilting_day = entry.data["tilting_day"]
-        self._protect_the_blinds = entry.data["protect_the_blinds"]
-        self._set_wind_speed = entry.data["wind_speed"]
-        self._wmo_code = entry.data["wmo_code"]
-        self._netamo_enable = entry.data["netamo_enable"]
-        self._netamo_speed_entity = entry.data["netamo_speed_entity"]
-        if self._netamo_speed_entity is not None:
-            self._wind_speed = self.hass.states.get(self._netamo_speed_entity).state
-        self._netamo_speed = entry.data["netamo_speed"]
-        self._netamo_gust_entity = entry.data["netamo_gust_entity"]
-        if self._netamo_gust_entity is not None:
-            self._gust_speed = self.hass.states.get(self._netamo_gust_entity).state
-        self._netamo_gust = entry.data["netamo_gust"]
-        self._send_stop_at_end = entry.data["send_stop_at_end"]
-        self._netamo_rain_entity = entry.data["netamo_rain_entity"]
-        if self._netamo_rain_entity is not None:
-            self._netamo_cur_rain = self.hass.states.get(self._netamo_rain_entity).state
-        self._netamo_rain = entry.data["netamo_rain"]
-
-        self._sun_next_sunrise = self.hass.states.get("sensor.sun_next_dawn").state
-        self._sun_next_sunset = self.hass.states.get("sensor.sun_next_dusk").state
+        self._timed_control_down = data["timed_control_down"]
+        self._time_to_roll_up = data["time_to_roll_up"]
+        self._timed_control_up = data["timed_control_up"]
+        self._time_to_roll_down = data["time_to_roll_down"]
+        # The times were compared with the UTC clock before version 2 of the entries,
+        # the migrated covers keep doing so (see async_migrate_entry)
+        self._time_zone = dt_util.UTC if data.get("timed_control_utc") else None
+        self._delay_control = data["delay_control"]
+        self._delay_sunrise = data["delay_sunrise"]
+        self._delay_sunset = data["delay_sunset"]
+        self._night_lights = data["night_lights"]
+        self._entity_night_lights = data["entity_night_lights"]
+        self._tilting_day = data["tilting_day"]
+        self._protect_the_blinds = data["protect_the_blinds"]
+        self._set_wind_speed = data["wind_speed"]
+        self._wmo_code = data["wmo_code"]
+        self._netamo_enable = data["netamo_enable"]
+        self._netamo_speed_entity = data["netamo_speed_entity"]
+        self._netamo_speed = data["netamo_speed"]
+        self._netamo_gust_entity = data["netamo_gust_entity"]
+        self._netamo_gust = data["netamo_gust"]
+        self._send_stop_at_end = data["send_stop_at_end"]
+        self._netamo_rain_entity = data["netamo_rain_entity"]
+        self._netamo_rain = data["netamo_rain"]
+        self._netamo_hysteresis = data.get("netamo_hysteresis", 10)
+        self._netamo_hold_time = data.get("netamo_hold_time", 300)
+
+        # Netatmo sensor entity -> monitor of its threshold, fed from state changes
+        self._netamo_monitors = {}
+        if self._netamo_enable:
+            for entity_id, threshold in (
+                (self._netamo_speed_entity, self._netamo_speed),
+                (self._netamo_gust_entity, self._netamo_gust),
+                (self._netamo_rain_entity, self._netamo_rain),
+            ):
+                if entity_id is not None and threshold is not None:
+                    self._netamo_monitors[entity_id] = ThresholdMonitor(
+                        threshold, self._netamo_hysteresis, self._netamo_hold_time
+                    )
+        self._unsubscribe_protection_release = None
+        # Weather coordinator of the location, set once subscribed
+        self._weather = None
+        # A scheduled close skipped while protected, done once the protection is released
+        self._protection_deferred_close = False
+
+        # Shared and already parsed next sunrise and sunset
+        self._sun = async_get_sun_times(hass)
 
         self._target_position = 0
         self._target_tilt_position = 0
+        # Tilt asked for together with a position (move_group), moved once the position is
+        # reached and the relays stopped, like set_cover_tilt_position after set_cover_position
+        self._pending_tilt_position = None
+
+        # Rapid set position commands are merged, the latest one wins
+        self._command_pipeline = CommandPipeline(
+            hass, data.get("command_window", 0.3), self._async_execute_queued
+        )
+        # Direction the relays were last commanded to while traveling, None when stopped
+        self._relay_direction = None
+        # Moves wait for a free motor of the relay group, see motors.py
+        self._motors = async_get_motor_scheduler(hass)
+        self._motor_group = data.get("motor_group")
+        # Relay calls that would not change anything are skipped, see relays.py
+        self._relays = async_get_relay_cache(hass)
+
+        self._unsubscribe_arrival = None
+        self._arrival_deadline = None
 
-        self._weather_check_counter = 0 
-        self._tilt_check_counter = 0
+        self._schedule_jobs = []
 
         self._unique_id = device_id
         if name:
@@ -124,16 +192,54 @@ class BlindsCover(CoverEntity, RestoreEntity):
         else:
             self._name = device_id
 
-        self._unsubscribe_auto_updater = None
+        # Both only depend on the configuration, the entity is recreated when it changes
+        self._tilt_support = (
+            data.get("tilt_open") is not None
+            and data.get("tilt_closed") is not None
+            and self._travel_tilt_open != 0
+            and self._travel_tilt_closed != 0
+        )
+        self._supported_features = (
+            CoverEntityFeature.OPEN
+            | CoverEntityFeature.CLOSE
+            | CoverEntityFeature.STOP
+            | CoverEntityFeature.SET_POSITION
+        )
+        if self._tilt_support:
+            self._supported_features |= (
+                CoverEntityFeature.OPEN_TILT
+                | CoverEntityFeature.CLOSE_TILT
+                | CoverEntityFeature.STOP_TILT
+                | CoverEntityFeature.SET_TILT_POSITION
+            )
+        # Built once, optionally only shown in the diagnostics
+        self.static_attributes = {
+            "entity_up": self._up_switch_entity_id,
+            "entity_down": self._down_switch_entity_id,
+            "time_up": self._travel_time_up,
+            "time_down": self._travel_time_down,
+            "tilt_open": self._travel_tilt_open,
+            "tilt_closed": self._travel_tilt_closed,
+        }
+        self._attributes_in_diagnostics_only = data.get("attributes_in_diagnostics_only", False)
+        # Set while a state is written, see async_write_ha_state
+        self._snapshot = None
+        # Limits the state writes of the motion ticker
+        self._publisher = MotionPublisher(
+            data.get("publish_step", DEFAULT_STEP),
+            data.get("publish_max_rate", DEFAULT_MAX_RATE),
+        )
 
         self.travel_calc = TravelCalculator(
             self._travel_time_down,
             self._travel_time_up,
+            bank=async_get_motion_ticker(hass).bank,
         )
         if self.has_tilt_support():
             self.tilt_calc = TravelCalculator(
                 self._travel_tilt_closed,
                 self._travel_tilt_open,
+                bank=async_get_motion_ticker(hass).bank,
             )
         else:
             self.tilt_calc = None  # Initialize tilt_calc to None if tilt support is not available
@@ -142,15 +248,7 @@ class BlindsCover(CoverEntity, RestoreEntity):
         self._switch_open_state = "off"
         self._night_lights_state = "off"
 
-    async def sun_state_changed(self, entity_id, old_state, new_state):
-        if new_state is not None:
-            if entity_id == "sensor.sun_next_dawn":
-                self._sun_next_sunrise = new_state.state
-            elif entity_id == "sensor.sun_next_dusk":
-                self._sun_next_sunset = new_state.state
-
 
-    
     # Return the name
     @property
     def name(self):
@@ -167,86 +265,102 @@ class BlindsCover(CoverEntity, RestoreEntity):
         return None
     
     # The state attributes include various details about the cover (for testing perhaps)
-    # Can be removed if not needed in UI
+    # They can be moved to the diagnostics with the attributes_in_diagnostics_only option
     @property
     def extra_state_attributes(self):
-        return {
-            "entity_up": self._up_switch_entity_id,
-            "entity_down": self._down_switch_entity_id,
-            "time_up": self._travel_time_up,
-            "time_down": self._travel_time_down,
-            "tilt_open": self._travel_tilt_open,
-            "tilt_closed": self._travel_tilt_closed,
-        }
+        if self._attributes_in_diagnostics_only:
+            return None
+        return self.static_attributes
     
     # Adds the features of the cover entity
-    # OPEN, CLOSE and STOP are always supported
-    # If has_tilt_support is True, OPEN_TILT, CLOSE_TILT and STOP_TILT are also supported
+    # OPEN, CLOSE, STOP and SET_POSITION are always supported
+    # If has_tilt_support is True, the tilt features are also supported
     # as the user wishes to be able to control the tilt of the cover
     @property
     def supported_features(self) -> CoverEntityFeature:
-        supported_features = (
-            CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP
-        )
-        if self.current_cover_position is not None:
-            supported_features |= CoverEntityFeature.SET_POSITION
+        return self._supported_features
 
-        if self.has_tilt_support():
-            supported_features |= (
-                CoverEntityFeature.OPEN_TILT
-                | CoverEntityFeature.CLOSE_TILT
-                | CoverEntityFeature.STOP_TILT
-            )
-            if self.current_cover_tilt_position is not None:
-                supported_features |= CoverEntityFeature.SET_TILT_POSITION
+    # All the motion properties below are read from one snapshot during a state write,
+    # so the position of each calculator is computed once per write
+    @callback
+    def async_write_ha_state(self):
+        self.stats.state_writes += 1
+        if self._snapshot is None:
+            self._snapshot = self._take_snapshot()
+        self._publisher.published(self._snapshot, self.hass.loop.time())
+        try:
+            super().async_write_ha_state()
+        finally:
+            self._snapshot = None
+
+    # Computes the snapshot from the calculators, or from the results of the last
+    # ticker pass over the calculator bank when computed is True
+    def _take_snapshot(self, computed=False):
+        opening = closing = False
+        positions = []
+        for calc in (self.travel_calc, self.tilt_calc):
+            if calc is None:
+                positions.append(None)
+                continue
+            if computed:
+                position = calc.computed_position()
+                traveling = not calc.computed_reached()
+            else:
+                exact = calc.exact_position()
+                position = round(exact)
+                traveling = exact != calc.travel_to_position
+            positions.append(position)
+            if traveling:
+                direction = calc.travel_direction
+                opening = opening or direction == TravelStatus.DIRECTION_UP
+                closing = closing or direction == TravelStatus.DIRECTION_DOWN
+        return MotionSnapshot(
+            positions[0],
+            positions[1],
+            positions[0] == self.travel_calc.position_closed,
+            opening,
+            closing,
+        )
 
-        return supported_features
+    def _motion(self):
+        return self._snapshot or self._take_snapshot()
 
     # Return the current position of the cover
     @property
     def current_cover_position(self) -> int | None:
-        return self.travel_calc.current_position()
+        return self._motion().position
     
     # Return the current tilt of the cover
     @property
     def current_cover_tilt_position(self) -> float | None:
-        if self.has_tilt_support():
-            return self.tilt_calc.current_position()
-        else:
-            return None
+        return self._motion().tilt_position
 
     # This properties (is_closed, is_opening and is_closing) are needed by the Home Assistant UI 
     # to display the state of the cover correctly
     @property
     def is_closed(self):
-        return self.travel_calc.is_closed()
+        return self._motion().is_closed
     
     @property
     def is_opening(self):
-        return (
-            self.travel_calc.is_traveling()
-            and self.travel_calc.travel_direction == TravelStatus.DIRECTION_UP
-        ) or (
-            self.has_tilt_support()
-            and self.tilt_calc.is_traveling()
-            and self.tilt_calc.travel_direction == TravelStatus.DIRECTION_UP
-        )
+        return self._motion().is_opening
 
     @property
     def is_closing(self):
-        return (
-            self.travel_calc.is_traveling()
-            and self.travel_calc.travel_direction == TravelStatus.DIRECTION_DOWN
-        ) or (
-            self.has_tilt_support()
-            and self.tilt_calc.is_traveling()
-            and self.tilt_calc.travel_direction == TravelStatus.DIRECTION_DOWN
-        )
+        return self._motion().is_closing
     
     # The cover is available if _available is True
     @property
     def available(self):
         return self._available  
+
+    # The cover can only be driven while both relays are loaded
+    def _relays_available(self):
+        for entity_id in (self._up_switch_entity_id, self._down_switch_entity_id):
+            state = self.hass.states.get(entity_id)
+            if state is None or state.state == STATE_UNAVAILABLE:
+                return False
+        return True
     
     # This functions are called while controlling the cover from the Home Assistant UI
     # and are used to open, close, stop, and set the position of the cover
@@ -254,34 +368,87 @@ class BlindsCover(CoverEntity, RestoreEntity):
 
     # This function is called to set the position of the cover
     async def async_set_cover_position(self, **kwargs):
-       if ATTR_POSITION in kwargs:
-           self._target_position = kwargs[ATTR_POSITION]
-           await self.set_position(self._target_position)
+        if ATTR_POSITION in kwargs:
+            await self._command_pipeline.async_submit(ATTR_POSITION, kwargs[ATTR_POSITION])
 
     # This function is called to set the position of the covers tilt
     async def async_set_cover_tilt_position(self, **kwargs):
         if ATTR_TILT_POSITION in kwargs:
-            _target_tilt_position = kwargs[ATTR_TILT_POSITION]
-            await self.set_tilt_position(_target_tilt_position)
+            await self._command_pipeline.async_submit(ATTR_TILT_POSITION, kwargs[ATTR_TILT_POSITION])
+
+    # Executes the position commands coming out of the command pipeline
+    async def _async_execute_queued(self, key, value):
+        if key == ATTR_POSITION:
+            async def start():
+                self._target_position = value
+                await self.set_position(value)
+        elif key == ATTR_TILT_POSITION:
+            async def start():
+                await self.set_tilt_position(value)
+        else:
+            return
+        await self._async_move(PRIORITY_USER, start)
+
+    # Every move waits for a free motor of the relay group of the cover, start() runs
+    # right away or once a motor is free
+    async def _async_move(self, priority, start):
+        requested = self.hass.loop.time()
+
+        async def run():
+            self.stats.timers["motor_wait"].add(self.hass.loop.time() - requested)
+            # A new command replaces the tilt still waiting for the previous one
+            self._pending_tilt_position = None
+            try:
+                await start()
+            finally:
+                self.release_idle_motor()
+
+        await self._motors.async_request(self._unique_id, self._motor_group, priority, run)
+
+    # Take a motor for a move of move_group, returns False if the relay group is full
+    def try_start_motor(self):
+        return self._motors.try_start(self._unique_id, self._motor_group)
+
+    # Give the motor back if the command did not move the cover after all
+    def release_idle_motor(self):
+        if self._arrival_deadline is None:
+            self._motors.release(self._unique_id, self._motor_group)
 
     # This function is called to set the cover to start closing
     async def async_close_cover(self, **kwargs):
+        await self._async_close(PRIORITY_USER)
+
+    async def _async_close(self, priority):
+        self._command_pipeline.cancel()
+        await self._async_move(priority, self._async_start_close)
+
+    async def _async_start_close(self):
         if self.travel_calc.current_position() > 0:
             self.travel_calc.start_travel_down()
-            self.start_auto_updater()
             self.update_tilt_before_travel(SERVICE_CLOSE_COVER)
+            self.start_auto_updater()
             await self._async_handle_command(SERVICE_CLOSE_COVER)
 
     # This function is called to set the cover to start opening
     async def async_open_cover(self, **kwargs):
+        await self._async_open(PRIORITY_USER)
+
+    async def _async_open(self, priority):
+        self._command_pipeline.cancel()
+        await self._async_move(priority, self._async_start_open)
+
+    async def _async_start_open(self):
         if self.travel_calc.current_position() < 100:
             self.travel_calc.start_travel_up()
-            self.start_auto_updater()
             self.update_tilt_before_travel(SERVICE_OPEN_COVER)
+            self.start_auto_updater()
             await self._async_handle_command(SERVICE_OPEN_COVER)
 
     # This function is called to move the cover tilting to close position
     async def async_close_cover_tilt(self, **kwargs):
+        await self._async_move(PRIORITY_USER, self._async_start_close_tilt)
+
+    async def _async_start_close_tilt(self):
         if self.tilt_calc.current_position() > 0:
             self.tilt_calc.start_travel_down()
             self.start_auto_updater()
@@ -289,18 +456,42 @@ class BlindsCover(CoverEntity, RestoreEntity):
 
     # This function is called to stop the cover tilting to open position
     async def async_open_cover_tilt(self, **kwargs):
+        await self._async_move(PRIORITY_USER, self._async_start_open_tilt)
+
+    async def _async_start_open_tilt(self):
         if self.tilt_calc.current_position() < 100:
             self.tilt_calc.start_travel_up()
             self.start_auto_updater()
             await self._async_handle_command(SERVICE_OPEN_COVER)
 
+    # Move to a position and/or tilt position like move_group does, used for the covers
+    # move_group could not start right away
+    async def async_move_to(self, position=None, tilt_position=None, priority=PRIORITY_USER):
+        async def start():
+            command = self.prepare_move(position, tilt_position)
+            if command is not None:
+                await self._async_switch_relays(command)
+
+        await self._async_move(priority, start)
+
 
     # This function is called to stop the cover from moving
     async def async_stop_cover(self, **kwargs):
+        self._command_pipeline.cancel()
+        self._motors.cancel(self._unique_id)
+        self._handle_my_button()
         await self._async_handle_command(SERVICE_STOP_COVER)
 
     # This function is called to move the cover to a designated position
     async def set_position(self, position):
+        command = self.prepare_position(position)
+        if command is not None:
+            # Execute the open or close command
+            await self._async_handle_command(command)
+
+    # Start the calculators moving to position without switching the relays,
+    # returns the command the relays have to execute (used by move_group as well)
+    def prepare_position(self, position):
         # Get the current position of the cover
         current_position = self.travel_calc.current_position()
         command = None
@@ -313,17 +504,42 @@ class BlindsCover(CoverEntity, RestoreEntity):
             # If the desired position is greater than the current position, open the cover
             command = SERVICE_OPEN_COVER
         if command is not None:
-            self.start_auto_updater()
             # Start moving the cover to the desired position
             self.travel_calc.start_travel(position)
             # Update the tilt of the cover before it starts moving
             self.update_tilt_before_travel(command)
-            # Execute the open or close command
-            await self._async_handle_command(command)
-        return
+            self.start_auto_updater()
+        return command
     
     # This function is called to move the cover tilt to a designated position
     async def set_tilt_position(self, position):
+        command = self.prepare_tilt_position(position)
+        if command is not None:
+            # Execute the open or close command
+            await self._async_handle_command(command)
+
+    # Start the calculators for a position and/or tilt target without switching the relays,
+    # if the position changes the tilt follows once it is reached (see _async_tilt_after_move)
+    # Returns None if the relays do not have to change
+    def prepare_move(self, position=None, tilt_position=None):
+        # The tilt of an earlier target is replaced, dropped if none is given
+        self._pending_tilt_position = None
+        command = None
+        if position is not None:
+            self._target_position = position
+            command = self.prepare_position(position)
+        if tilt_position is not None and self.has_tilt_support():
+            if command is None:
+                command = self.prepare_tilt_position(tilt_position)
+            else:
+                self._pending_tilt_position = tilt_position
+        if command is None or command == self._relay_direction:
+            return None
+        self.set_command_state(command)
+        return command
+
+    # Same as prepare_position for the tilt
+    def prepare_tilt_position(self, position):
         # Get the current tilt position
         current_position = self.tilt_calc.current_position()
         command = None
@@ -337,14 +553,10 @@ class BlindsCover(CoverEntity, RestoreEntity):
             command = SERVICE_OPEN_COVER
 
         if command is not None:
-            self.start_auto_updater()
             # Start moving the tilt to the desired position
             self.tilt_calc.start_travel(position)
-            # Execute the open or close command
-            await self._async_handle_command(command)
-
-        # The function does not return anything
-        return
+            self.start_auto_updater()
+        return command
 
     # This function is called to update the tilt before travel
     def update_tilt_before_travel(self, command):
@@ -358,158 +570,310 @@ class BlindsCover(CoverEntity, RestoreEntity):
     def stop_auto_updater(self):
         self._target_position = 0
         self._target_tilt_position = 0
-        if self._unsubscribe_auto_updater is not None:
-            self._unsubscribe_auto_updater()
-            self._unsubscribe_auto_updater = None
+        self._relay_direction = None
+        async_get_motion_ticker(self.hass).async_remove(self)
+        self._cancel_arrival()
+        self._motors.release(self._unique_id, self._motor_group)
 
+    # Has to be called after the calculators started traveling,
+    # the end of travel is scheduled from their arrival time
     def start_auto_updater(self):
-        if self._unsubscribe_auto_updater is None:
-            interval = timedelta(seconds=0.1)
-            self._unsubscribe_auto_updater = async_track_time_interval(
-                self.hass, self.auto_updater_hook, interval)
-
+        async_get_motion_ticker(self.hass).async_add(self)
+        self._schedule_arrival()
+        self._journal_motion()
+
+    # Called by the shared motion ticker on every tick while the cover is moving
+    # It only refreshes the state, the end of travel is handled by _async_arrival
+    # The ticker computed the positions of all covers just before in the calculator bank,
+    # the state is only written when the publishing policy lets it through
     @callback
     def auto_updater_hook(self, now):
-        self.async_schedule_update_ha_state()
-        if self.position_reached():
-            self.stop_auto_updater()
-        self.hass.async_create_task(self.auto_stop_if_necessary())
-
-    async def add_ons(self, now):
-        # Adjust the current time by adding one hour
-        corrected_time = now + timedelta(hours=0) # Edit the time if needed to correct the time zone
-
-        # Format the corrected time to display only HH:MM
-        formatted_time = corrected_time.strftime("%H:%M")
-
-
-        if self._timed_control_down and not self.travel_calc.is_traveling():
-            try:
-                parsed_time_to_roll_down = datetime.strptime(self._time_to_roll_down, "%H:%M")
-                formatted_time_to_roll_down = parsed_time_to_roll_down.strftime("%H:%M")  
-            except ValueError:
-                _LOGGER.error("Invalid format for timed control")
-                return
-            
-            if formatted_time_to_roll_down == formatted_time and self.travel_calc.current_position() > 0:
-                await self.async_close_cover()
-        
-        if self._timed_control_up and not self.travel_calc.is_traveling():
-            try:
-                parsed_time_to_roll_up = datetime.strptime(self._time_to_roll_up, "%H:%M")
-                formatted_time_to_roll_up = parsed_time_to_roll_up.strftime("%H:%M")
-            except ValueError:
-                _LOGGER.error("Invalid format for timed control")
+        self.stats.ticks += 1
+        snapshot = self._take_snapshot(computed=True)
+        if self._publisher.should_publish(snapshot, self.hass.loop.time()):
+            self._snapshot = snapshot
+            self.async_write_ha_state()
+        if self.travel_calc.computed_reached() and (
+            self.tilt_calc is None or self.tilt_calc.computed_reached()
+        ):
+            async_get_motion_ticker(self.hass).async_remove(self)
+
+    # Give the rows of the calculators back to the shared bank
+    def _release_calculators(self):
+        for calc in (self.travel_calc, self.tilt_calc):
+            if calc is not None:
+                calc.release()
+
+    # Schedule the end of travel once for the moment both calculators arrive,
+    # a new command replaces the previous deadline
+    def _schedule_arrival(self):
+        self._cancel_arrival()
+        deadlines = [
+            calc.arrival_time()
+            for calc in (self.travel_calc, self.tilt_calc)
+            if calc is not None and calc.arrival_time() is not None
+        ]
+        if not deadlines:
+            return
+        self._arrival_deadline = max(deadlines)
+        delay = max(0, self._arrival_deadline - self.travel_calc.current_time())
+        self._unsubscribe_arrival = async_call_later(self.hass, delay, self._async_arrival)
+
+    def _cancel_arrival(self):
+        self._arrival_deadline = None
+        if self._unsubscribe_arrival is not None:
+            self._unsubscribe_arrival()
+            self._unsubscribe_arrival = None
+
+    async def _async_arrival(self, now):
+        self._unsubscribe_arrival = None
+        remaining = self._arrival_deadline - self.travel_calc.current_time()
+        if remaining > 0:
+            # The timer fired a little early, wait for the rest
+            self._unsubscribe_arrival = async_call_later(self.hass, remaining, self._async_arrival)
+            return
+        self.async_write_ha_state()
+        self.stop_auto_updater()
+        await self.auto_stop_if_necessary()
+        self._journal_motion()
+        if self._pending_tilt_position is not None:
+            if self._switch_open_state == "off" and self._switch_close_state == "off":
+                await self._async_tilt_after_move()
+            else:
+                # The motor has to stop before the tilt reverses it, the tilt starts
+                # when the relays report the stop (see _handle_state_changed)
+                await self._async_handle_command(SERVICE_STOP_COVER)
+
+    # Move the tilt asked for together with the position that was just reached
+    async def _async_tilt_after_move(self):
+        tilt_position, self._pending_tilt_position = self._pending_tilt_position, None
+        await self._async_move(PRIORITY_USER, lambda: self.set_tilt_position(tilt_position))
+
+    # Record the exact positions and the travel in progress, so a restart can resume it
+    def _journal_motion(self):
+        wall_now = time.time()
+        record = {
+            "position": self.travel_calc.exact_position(),
+            "travel": travel_segment(self.travel_calc, wall_now),
+        }
+        if self.tilt_calc is not None:
+            record["tilt_position"] = self.tilt_calc.exact_position()
+            record["tilt"] = travel_segment(self.tilt_calc, wall_now)
+        async_get_travel_journal(self.hass).async_record(self._unique_id, record)
+
+    # Continue the travel interrupted by a restart from the journal, the relay tells
+    # whether the motor kept running meanwhile
+    async def _async_resume_travel(self, record):
+        wall_now = time.time()
+        for calc, position_key, segment_key in (
+            (self.travel_calc, "position", "travel"),
+            (self.tilt_calc, "tilt_position", "tilt"),
+        ):
+            if calc is None:
+                continue
+            if record.get(segment_key) is not None:
+                resume_segment(calc, record[segment_key], wall_now)
+            elif record.get(position_key) is not None:
+                calc.set_position(record[position_key])
+
+        segment = record.get("travel") or record.get("tilt")
+        if segment is None:
+            return
+        if segment["target"] > segment["start"]:
+            command, relay = SERVICE_OPEN_COVER, self._up_switch_entity_id
+        else:
+            command, relay = SERVICE_CLOSE_COVER, self._down_switch_entity_id
+        relay_state = self.hass.states.get(relay)
+        if relay_state is not None and relay_state.state == "on":
+            # The motor kept running, follow it and stop it at the target
+            self._motors.claim(self._unique_id, self._motor_group)
+            self._relay_direction = command
+            if command == SERVICE_OPEN_COVER:
+                self._switch_open_state = "on"
+            else:
+                self._switch_close_state = "on"
+            if self.position_reached():
+                await self.auto_stop_if_necessary()
+            else:
+                self.start_auto_updater()
                 return
-            
-            if formatted_time_to_roll_up == formatted_time and self.travel_calc.current_position() < 100:
-                await self.async_open_cover()
-
-        if self._delay_control and not self.travel_calc.is_traveling():
-            parse_time_sunset = datetime.fromisoformat(self._sun_next_sunset)
-            parse_time_sunrise = datetime.fromisoformat(self._sun_next_sunrise)
-
-            formatted_time_sunset = parse_time_sunset.strftime("%H:%M")
-            formatted_time_sunrise = parse_time_sunrise.strftime("%H:%M")
-
-            parsed_offset_sunset = datetime.strptime(formatted_time_sunset, "%H:%M")
-            parsed_offset_sunrise = datetime.strptime(formatted_time_sunrise, "%H:%M")
-
-            offset_time_sunset = parsed_offset_sunset + timedelta(minutes=self._delay_sunset)
-            offset_time_sunrise = parsed_offset_sunrise + timedelta(minutes=self._delay_sunrise)
+        else:
+            # The motor stopped at an unknown moment, the best estimate is where it
+            # would be by now, at most the target
+            self.travel_calc.stop()
+            if self.tilt_calc is not None:
+                self.tilt_calc.stop()
+        self._journal_motion()
 
-            formatted_offset_sunset = offset_time_sunset.strftime("%H:%M")
-            formatted_offset_sunrise = offset_time_sunrise.strftime("%H:%M")
+    # Compile the timed control, sunrise/sunset and tilting day rules into absolute
+    # fire times kept by the shared schedule engine
+    # Called again whenever the sun times change
+    @callback
+    def _compile_schedule(self):
+        self._cancel_schedule()
+
+        sunrise = self._sun.sunrise
+        sunset = self._sun.sunset
+        previous_sunrise = self._sun.previous_sunrise
+        previous_sunset = self._sun.previous_sunset
+        rules = []
+
+        time_zone = self._time_zone
+        if self._timed_control_down:
+            time_to_roll_down = self._parse_time_of_day(self._time_to_roll_down)
+            if time_to_roll_down is not None:
+                rules.append((lambda now: next_time_of_day(time_to_roll_down, now, time_zone), self._async_scheduled_close))
+
+        if self._timed_control_up:
+            time_to_roll_up = self._parse_time_of_day(self._time_to_roll_up)
+            if time_to_roll_up is not None:
+                rules.append((lambda now: next_time_of_day(time_to_roll_up, now, time_zone), self._async_scheduled_open))
+
+        if self._delay_control:
+            delay_sunset = timedelta(minutes=self._delay_sunset)
+            delay_sunrise = timedelta(minutes=self._delay_sunrise)
+            rules.append((lambda now: next_sun_event(sunset, previous_sunset, delay_sunset, now), self._async_scheduled_close))
+            rules.append((lambda now: next_sun_event(sunrise, previous_sunrise, delay_sunrise, now), self._async_scheduled_open))
+
+        if self._night_lights:
+            rules.append((lambda now: next_sun_event(sunset, previous_sunset, timedelta(0), now), self._async_night_lights_close))
+
+        if self.has_tilt_support() and self._tilting_day:
+            # Keep the tilt open, checked every 10 minutes during the day only
+            def next_tilt_check(now):
+                if self._sun.is_day():
+                    return now + timedelta(minutes=10)
+                return next_sun_event(sunrise, previous_sunrise, timedelta(0), now)
+            rules.append((next_tilt_check, self._async_tilting_day))
+
+        engine = async_get_schedule_engine(self.hass)
+        for next_fire, action in rules:
+            self._schedule_jobs.append(engine.async_add(next_fire, action, key=self._unique_id))
+
+    def _cancel_schedule(self):
+        for job in self._schedule_jobs:
+            job.cancel()
+        self._schedule_jobs = []
+
+    # Parse HH:MM once when compiling the schedule
+    @staticmethod
+    def _parse_time_of_day(value):
+        try:
+            return datetime.strptime(value, "%H:%M").time()
+        except (TypeError, ValueError):
+            _LOGGER.error("Invalid format for timed control")
+            return None
 
-            if formatted_offset_sunset == formatted_time and self.travel_calc.current_position() > 0:
-                await self.async_close_cover()
+    @timed("add_ons")
+    async def _async_scheduled_close(self, now):
+        # Do not roll down into a storm, close once the protection is released
+        if self.protection_active():
+            self._protection_deferred_close = True
+            return
+        if not self.travel_calc.is_traveling() and self.travel_calc.current_position() > 0:
+            await self._async_close(PRIORITY_SCHEDULE)
+
+    @timed("add_ons")
+    async def _async_scheduled_open(self, now):
+        self._protection_deferred_close = False
+        if not self.travel_calc.is_traveling() and self.travel_calc.current_position() < 100:
+            await self._async_open(PRIORITY_SCHEDULE)
+
+    @timed("add_ons")
+    async def _async_night_lights_close(self, now=None):
+        if self._night_lights_state == "on":
+            await self._async_scheduled_close(now)
+
+    @timed("add_ons")
+    async def _async_tilting_day(self, now):
+        if (
+            self._sun.is_day()
+            and not self.travel_calc.is_traveling()
+            and not self.tilt_calc.is_traveling()
+            and self.tilt_calc.current_position() < 100
+        ):
+            await self._async_move(PRIORITY_SCHEDULE, self._async_start_open_tilt)
+
+    # Called by the dispatcher for every change of a Netatmo sensor
+    @timed("add_ons")
+    async def _handle_netamo_changed(self, event):
+        monitor = self._netamo_monitors[event.data["entity_id"]]
+        value = parse_reading(event.data.get("new_state"))
+        if value is None:
+            return
+        monitor.update(value, time.monotonic())
+        if monitor.exceeded():
+            _LOGGER.info("%s is too high: %s", event.data["entity_id"], value)
+            await self._async_protect()
+        self._schedule_protection_release()
+
+    # Protecting the blinds means rolling them up, once the relays can be commanded
+    async def _async_protect(self):
+        if not self._available:
+            return
+        if not self.travel_calc.is_traveling() and self.travel_calc.current_position() < 100:
+            await self._async_open(PRIORITY_PROTECTION)
+
+    # Protect from the readings already known, a Netatmo sensor may not report again for
+    # minutes (called at start and once the relays are loaded)
+    async def _async_protect_from_readings(self):
+        for entity_id, monitor in self._netamo_monitors.items():
+            if monitor.exceeded():
+                _LOGGER.info("%s is too high: %s", entity_id, monitor.value)
+                await self._async_protect()
+                return
+        if self._weather is not None and self._weather.usable_data() is not None:
+            self._async_weather_updated(self._weather.usable_data())
+
+    # The blinds are protected while any monitor is tripped
+    def protection_active(self):
+        now = time.monotonic()
+        active = False
+        for monitor in self._netamo_monitors.values():
+            monitor.check_release(now)
+            active = active or monitor.tripped
+        return active
+
+    def _schedule_protection_release(self):
+        self._cancel_protection_release()
+        release_times = [
+            monitor.release_at()
+            for monitor in self._netamo_monitors.values()
+            if monitor.release_at() is not None
+        ]
+        if release_times:
+            delay = max(0, max(release_times) - time.monotonic())
+            self._unsubscribe_protection_release = async_call_later(
+                self.hass, delay, self._async_protection_release
+            )
 
-            if formatted_offset_sunrise == formatted_time and self.travel_calc.current_position() < 100:
-                await self.async_open_cover()
+    def _cancel_protection_release(self):
+        if self._unsubscribe_protection_release is not None:
+            self._unsubscribe_protection_release()
+            self._unsubscribe_protection_release = None
 
-        if self._night_lights and not self.travel_calc.is_traveling():
-            parse_time_sunset = datetime.fromisoformat(self._sun_next_sunset)
-            parse_time_sunrise = datetime.fromisoformat(self._sun_next_sunrise)
+    async def _async_protection_release(self, now):
+        self._unsubscribe_protection_release = None
+        if self.protection_active():
+            self._schedule_protection_release()
+            return
+        if self._protection_deferred_close:
+            self._protection_deferred_close = False
+            await self._async_scheduled_close(now)
 
-            formatted_time_sunset = parse_time_sunset.strftime("%H:%M")
-            formatted_time_sunrise = parse_time_sunrise.strftime("%H:%M")
+    # Called by the shared weather coordinator with every new reading
+    @callback
+    @timed("add_ons")
+    def _async_weather_updated(self, data):
+        if not self._available or self.travel_calc.is_traveling() or self.travel_calc.current_position() >= 100:
+            return
+        if data.wind_speed is not None and data.wind_speed > self._set_wind_speed:
+            _LOGGER.info("Wind speed is too high: %s", data.wind_speed)
+            self.hass.async_create_task(self._async_open(PRIORITY_PROTECTION))
+        elif data.weather_code is not None and data.weather_code > self._wmo_code:
+            _LOGGER.info("Weather code indicates rain: %s", data.weather_code)
+            self.hass.async_create_task(self._async_open(PRIORITY_PROTECTION))
 
-            if (formatted_time > formatted_time_sunset or formatted_time < formatted_time_sunrise) and self._night_lights_state == "on" and self.travel_calc.current_position() > 0:
-                await self.async_close_cover()
-        
-        if self.has_tilt_support():
-            self._tilt_check_counter += 1
-            if self._tilt_check_counter == 10:
-                self._tilt_check_counter = 0
-                if self._tilting_day and not self.travel_calc.is_traveling() and not self.tilt_calc.is_traveling():
-                    parse_time_sunset = datetime.fromisoformat(self._sun_next_sunset)
-                    parse_time_sunrise = datetime.fromisoformat(self._sun_next_sunrise)
-
-                    formatted_time_sunset = parse_time_sunset.strftime("%H:%M")
-                    formatted_time_sunrise = parse_time_sunrise.strftime("%H:%M")
-
-                    if not (formatted_time > formatted_time_sunset or formatted_time < formatted_time_sunrise) and self.tilt_calc.current_position() < 100:
-                        await self.async_open_cover_tilt()
-
-        if self._netamo_enable and not self.travel_calc.is_traveling():
-            _LOGGER.info("wind: %s", self._wind_speed)
-            _LOGGER.info("wind: %s", self._netamo_speed)
-            _LOGGER.info("gust: %s", self._gust_speed)
-            _LOGGER.info("gust: %s", self._netamo_gust)
-            self._wind_speed = float(self._wind_speed)
-            self._netamo_speed = float(self._netamo_speed)
-            self._gust_speed = float(self._gust_speed)
-            self._netamo_gust = float(self._netamo_gust)
-            self._netamo_cur_rain = float(self._netamo_cur_rain)
-            self._netamo_rain = float(self._netamo_rain)
-            if self._wind_speed > self._netamo_speed and self.travel_calc.current_position() < 100:
-                await self.async_open_cover()
-            elif self._gust_speed > self._netamo_gust and self.travel_calc.current_position() < 100:
-                await self.async_open_cover()
-            elif self._netamo_cur_rain > self._netamo_rain and self.travel_calc.current_position() < 100:
-                await self.async_open_cover()
-
-        _LOGGER.info("self._protect_the_blinds: %s", self._protect_the_blinds)
-        if self._protect_the_blinds and not self.travel_calc.is_traveling():
-                    self._weather_check_counter += 1
-                     # Check if the counter reaches 30
-                    if self._weather_check_counter == 30:
-                        self._weather_check_counter = 0
-                        latitude, longitude = self.get_location_coordinates(self.hass)
-                        _LOGGER.info("Latitude: %s, Longitude: %s", latitude, longitude)
-                        
-                        # Construct the API URL
-                        api_url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current=wind_speed_10m&daily=weather_code"
-                        
-                        try:
-                            # Make the request asynchronously
-                            response = await self.hass.async_add_executor_job(urllib.request.urlopen, api_url)
-                            data = json.loads(response.read().decode('utf-8'))
-                            _LOGGER.info("Retrieved data: %s", data)
-                            
-                            # Extract wind speed and weather code
-                            current_data = data.get('current', {})
-                            wind_speed = current_data.get('wind_speed_10m')
-                            
-                            daily_data = data.get('daily', {})
-                            weather_code = daily_data.get('weather_code')
-                            
-                            if wind_speed > self._set_wind_speed and self.travel_calc.current_position() < 100:
-                                await self.async_open_cover()
-                                _LOGGER.info("Wind speed is too high: %s", wind_speed)
-                            today_weather_code = data.get('daily', {}).get('weather_code', [])[0]
-                            if today_weather_code > self._wmo_code and self.travel_calc.current_position() < 100:
-                                await self.async_open_cover()
-                                _LOGGER.info("Weather code indicates rain: %s", weather_code)
-                            
-                            _LOGGER.info("Wind speed: %s, Weather code: %s", wind_speed, weather_code)
-                            
-                        except Exception as e:
-                            _LOGGER.error("Error retrieving weather data: %s", e)
-
-        _LOGGER.info("Current time: %s", formatted_time)   
-                
-        
     # This function is called to get latitude and longitude from Home Assistant configuration
     def get_location_coordinates(self, hass):
         # Access the latitude and longitude from Home Assistant configuration
@@ -527,18 +891,32 @@ class BlindsCover(CoverEntity, RestoreEntity):
     # based on the user input in the configuration flow or option flow
     # Returns True if the cover supports tilt, False otherwise  
     def has_tilt_support(self):
-        return (
-            self.entry.data.get("tilt_open") is not None
-            and self.entry.data.get("tilt_closed") is not None
-            and self._travel_tilt_open != 0
-            and self._travel_tilt_closed != 0
-        )
+        return self._tilt_support
     
+    @timed("state_changed")
     async def _handle_state_changed(self, event):
+        if event.data.get("entity_id") in (self._up_switch_entity_id, self._down_switch_entity_id):
+            self._relays.async_observed(
+                event.data["entity_id"], event.data.get("old_state"), event.data.get("new_state")
+            )
+            available = self._relays_available()
+            if available != self._available:
+                self._available = available
+                if available and self._pending_resume is not None:
+                    # The relay states tell whether the motor kept running, resume now they are known
+                    record, self._pending_resume = self._pending_resume, None
+                    await self._async_resume_travel(record)
+                if available:
+                    await self._async_protect_from_readings()
+                self.async_write_ha_state()
+
         if event.data.get("new_state") is None:
             return
 
         if event.data.get("old_state") is None:
+            # An entity loaded after the cover is taken as it is, not as a change
+            if event.data.get("entity_id") == self._entity_night_lights:
+                self._night_lights_state = event.data.get("new_state").state
             return
 
         if event.data.get("new_state").state == event.data.get("old_state").state:
@@ -548,6 +926,10 @@ class BlindsCover(CoverEntity, RestoreEntity):
             if self._night_lights_state == event.data.get("new_state").state:
                 return
             self._night_lights_state = event.data.get("new_state").state
+            # Roll down as soon as the entity is turned on during the night
+            if self._night_lights and self._sun.is_night():
+                await self._async_night_lights_close()
+            return
 
         if event.data.get("entity_id") == self._down_switch_entity_id:
             if self._switch_close_state == event.data.get("new_state").state:
@@ -562,13 +944,20 @@ class BlindsCover(CoverEntity, RestoreEntity):
 
         if self._switch_open_state == "off" and self._switch_close_state == "off":
             self._handle_my_button()
+            if self._pending_tilt_position is not None:
+                await self._async_tilt_after_move()
         elif self._switch_open_state == "on" and self._switch_close_state == "on":
             self._handle_my_button()
+            self.stats.relay_calls += 1
             if event.data.get("entity_id") == self._down_switch_entity_id:
+                self._relays.record(self._up_switch_entity_id, "off")
                 await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": self._up_switch_entity_id}, False)
             if event.data.get("entity_id") == self._up_switch_entity_id:
+                self._relays.record(self._down_switch_entity_id, "off")
                 await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": self._down_switch_entity_id}, False)
         elif self._switch_open_state == "on" and self._switch_close_state == "off":
+            # The motor runs, whoever switched the relay
+            self._motors.claim(self._unique_id, self._motor_group)
             if not self.has_tilt_support():
                 if self._target_position != 100 and self._target_position != 0:
                     self.travel_calc.start_travel(self._target_position)
@@ -586,6 +975,7 @@ class BlindsCover(CoverEntity, RestoreEntity):
                         self.travel_calc.start_travel_up()
                     self.start_auto_updater()
         elif self._switch_open_state == "off" and self._switch_close_state == "on":
+            self._motors.claim(self._unique_id, self._motor_group)
             if not self.has_tilt_support():
                 if self._target_position != 100 and self._target_position != 0:
                     self.travel_calc.start_travel(self._target_position)
@@ -607,18 +997,73 @@ class BlindsCover(CoverEntity, RestoreEntity):
             
 
     async def async_added_to_hass(self):
-        self.hass.bus.async_listen("state_changed", self._handle_state_changed)
-        # Set up periodic time update
-        self.hass.helpers.event.async_track_time_interval(self.add_ons, timedelta(minutes=1))
-        async_track_state_change(
-            self.hass, "sensor.sun_next_dawn", self.sun_state_changed
-        )
-        async_track_state_change(
-            self.hass, "sensor.sun_next_dusk", self.sun_state_changed
+        # Make the cover reachable for the integration services (e.g. move_group)
+        covers = self.hass.data.setdefault(DATA_COVERS, {})
+        covers[self.entity_id] = self
+        self.async_on_remove(lambda: covers.pop(self.entity_id, None))
+        # The relays and sensors may load after the cover, they are picked up
+        # from the dispatcher as they appear
+        self._available = self._relays_available()
+        if self._entity_night_lights and self.hass.states.get(self._entity_night_lights) is not None:
+            self._night_lights_state = self.hass.states.get(self._entity_night_lights).state
+        # Only state changes of our own relays and night lights entity are routed here
+        self.async_on_remove(
+            async_get_dispatcher(self.hass).async_register(
+                (
+                    self._up_switch_entity_id,
+                    self._down_switch_entity_id,
+                    self._entity_night_lights,
+                ),
+                self._handle_state_changed,
+            )
         )
+        # Leave the motion ticker and drop the end of travel if the cover is removed while moving
+        self.async_on_remove(self.stop_auto_updater)
+        self.async_on_remove(self._release_calculators)
+        self.async_on_remove(self._command_pipeline.cancel)
+        self.async_on_remove(lambda: self._motors.cancel(self._unique_id))
+        # Recompile the schedule whenever the shared sun times change
+        self.async_on_remove(self._sun.async_subscribe(self._compile_schedule))
+        self._compile_schedule()
+        self.async_on_remove(self._cancel_schedule)
+        # Netatmo readings are pushed by the dispatcher as they change
+        if self._netamo_monitors:
+            self.async_on_remove(
+                async_get_dispatcher(self.hass).async_register(
+                    self._netamo_monitors, self._handle_netamo_changed
+                )
+            )
+            self.async_on_remove(self._cancel_protection_release)
+            now = time.monotonic()
+            for entity_id, monitor in self._netamo_monitors.items():
+                value = parse_reading(self.hass.states.get(entity_id))
+                if value is not None:
+                    monitor.update(value, now)
+
+        await self._async_restore_position()
+
+        # Protect from the readings known at start only once the position is restored,
+        # the weather coordinator pushes its last reading on subscribing
+        await self._async_protect_from_readings()
+        if self._protect_the_blinds:
+            latitude, longitude = self.get_location_coordinates(self.hass)
+            self._weather = async_get_weather_coordinator(self.hass, latitude, longitude)
+            # Weather readings are fetched once per location and pushed to all covers
+            self.async_on_remove(self._weather.async_subscribe(self._async_weather_updated))
+
+    async def _async_restore_position(self):
+        # The journal is more recent and exact than the last state, it also holds the travel
+        journal = async_get_travel_journal(self.hass)
+        await journal.async_load()
+        record = journal.get(self._unique_id)
+        if record is not None:
+            if self._available:
+                await self._async_resume_travel(record)
+            else:
+                # A relay loads after the cover, resumed from _handle_state_changed once it is there
+                self._pending_resume = record
+            return
 
-
-        
         old_state = await self.async_get_last_state()
 
         if (old_state is not None and self.travel_calc is not None and old_state.attributes.get(ATTR_CURRENT_POSITION) is not None):
@@ -635,11 +1080,15 @@ class BlindsCover(CoverEntity, RestoreEntity):
                 )
 
     def _handle_my_button(self):
+        self._relay_direction = None
         if self.travel_calc.is_traveling() or (self.has_tilt_support() and self.tilt_calc.is_traveling()):
+            # Interrupted before the position was reached, the tilt does not follow
+            self._pending_tilt_position = None
             self.travel_calc.stop()
             if self.has_tilt_support():
                 self.tilt_calc.stop()
             self.stop_auto_updater()
+            self._journal_motion()
         
 
     # This function is called to stop the cover if it has reached its final position
@@ -664,22 +1113,66 @@ class BlindsCover(CoverEntity, RestoreEntity):
                         await self._async_handle_command(SERVICE_STOP_COVER)
 
 
-    async def _async_handle_command(self, command, *args):
-        if command == "close_cover":
-            self._state = False
-            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": self._up_switch_entity_id}, False)
-            await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": self._down_switch_entity_id}, False)
+    # Return the relay service calls executing the command as (service, entity_id),
+    # the relay that has to be off always comes first
+    def relay_calls(self, command):
+        if command == SERVICE_CLOSE_COVER:
+            return [("turn_off", self._up_switch_entity_id), ("turn_on", self._down_switch_entity_id)]
+        if command == SERVICE_OPEN_COVER:
+            return [("turn_off", self._down_switch_entity_id), ("turn_on", self._up_switch_entity_id)]
+        if command == SERVICE_STOP_COVER:
+            return [("turn_off", self._up_switch_entity_id), ("turn_off", self._down_switch_entity_id)]
+        return []
+
+    # The relay calls of the command that switch a relay, the relays already in their
+    # state are left out (used by move_group as well)
+    def needed_relay_calls(self, command):
+        calls = []
+        for service, entity_id in self.relay_calls(command):
+            if self._relays.needed(entity_id, SERVICE_STATES[service]):
+                self._relays.record(entity_id, SERVICE_STATES[service])
+                calls.append((service, entity_id))
+            else:
+                self.stats.relay_calls_skipped += 1
+        return calls
 
-        elif command == "open_cover":
+    # Remember the direction of the command
+    def set_command_state(self, command):
+        if command == SERVICE_CLOSE_COVER:
+            self._state = False
+        elif command in (SERVICE_OPEN_COVER, SERVICE_STOP_COVER):
             self._state = True
-            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": self._down_switch_entity_id}, False)
-            await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": self._up_switch_entity_id}, False)
+        self._relay_direction = None if command == SERVICE_STOP_COVER else command
 
-        elif command == "stop_cover":
-            self._state = True
-            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": self._up_switch_entity_id}, False)
-            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": self._down_switch_entity_id}, False)
+    async def _async_handle_command(self, command, *args):
+        # The relays already drive the cover this way, the calculators were just retargeted
+        if command != SERVICE_STOP_COVER and command == self._relay_direction:
+            self.async_write_ha_state()
+            return
+        self.set_command_state(command)
+        try:
+            await self._async_switch_relays(command)
+        except Exception:
+            self.abort_command()
+            raise
+
+    # The relays did not follow the command, the cover is not moving this way
+    # (used by move_group as well)
+    def abort_command(self):
+        self._handle_my_button()
+        self.async_write_ha_state()
 
+    async def _async_switch_relays(self, command):
+        calls = self.needed_relay_calls(command)
+        for index, (service, entity_id) in enumerate(calls):
+            self.stats.relay_calls += 1
+            try:
+                await self.hass.services.async_call("homeassistant", service, {"entity_id": entity_id}, False)
+            except Exception:
+                # This call and the ones not sent yet did not switch their relay
+                for unsent, unsent_entity_id in calls[index:]:
+                    self._relays.forget(unsent_entity_id, SERVICE_STATES[unsent])
+                raise
 
         # Update state of entity
-        self.async_write_ha_state()
\ No newline at end of file
+        self.async_write_ha_state()
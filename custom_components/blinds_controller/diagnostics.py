@@ -0,0 +1,91 @@
+"""
+Diagnostics of the blinds controller, downloadable from the config entry page.
+
+Besides the configuration of the cover the download holds its runtime counters and the
+counters of the objects shared by all covers: the motion ticker, the calculator bank,
+the schedule engine, the motor scheduler, the relay cache and the weather coordinators.
+"""
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_COVERS, DATA_MOTION_TICKER, DATA_MOTOR_SCHEDULER, DATA_RELAY_CACHE, DATA_SCHEDULE_ENGINE,
+    DATA_WEATHER,
+)
+from .batch import cover_configs
+from .stats import async_get_cover_stats
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return the diagnostics of the config entry."""
+    return {
+        "entry": dict(entry.data),
+        "covers": [
+            _cover_diagnostics(hass, device_id)
+            for device_id, _, _ in cover_configs(entry)
+        ],
+        "integration": _integration_diagnostics(hass),
+    }
+
+
+def _cover_diagnostics(hass, device_id):
+    diagnostics = {"stats": async_get_cover_stats(hass, device_id).as_dict()}
+    cover = next(
+        (cover for cover in hass.data.get(DATA_COVERS, {}).values()
+         if cover._unique_id == device_id),
+        None,
+    )
+    if cover is None:
+        return diagnostics
+    ticker = hass.data.get(DATA_MOTION_TICKER)
+    diagnostics.update(
+        entity_id=cover.entity_id,
+        attributes=cover.static_attributes,
+        position=cover.current_cover_position,
+        tilt_position=cover.current_cover_tilt_position,
+        moving=ticker is not None and cover in ticker,
+        scheduled_jobs=len(cover._schedule_jobs),
+        schedule_offset_s=cover._schedule_jobs[0].offset.total_seconds() if cover._schedule_jobs else None,
+        motor_group=cover._motor_group,
+        commands_submitted=cover._command_pipeline.submitted,
+        commands_merged=cover._command_pipeline.merged,
+    )
+    return diagnostics
+
+
+def _integration_diagnostics(hass):
+    diagnostics = {"covers": len(hass.data.get(DATA_COVERS, {}))}
+    ticker = hass.data.get(DATA_MOTION_TICKER)
+    if ticker is not None:
+        diagnostics["ticker"] = {
+            "moving": len(ticker),
+            "calculators": len(ticker.bank),
+            "ticks": ticker.timer.as_dict(),
+        }
+    engine = hass.data.get(DATA_SCHEDULE_ENGINE)
+    if engine is not None:
+        diagnostics["schedule"] = {
+            "pending": len(engine),
+            "spread_s": engine.spread.total_seconds(),
+            "fired": engine.fired,
+            "misses": engine.misses,
+            "max_lateness_s": engine.max_lateness.total_seconds(),
+        }
+    motors = hass.data.get(DATA_MOTOR_SCHEDULER)
+    if motors is not None:
+        diagnostics["motors"] = motors.as_dict()
+    relays = hass.data.get(DATA_RELAY_CACHE)
+    if relays is not None:
+        diagnostics["relays"] = relays.as_dict()
+    # Coordinates are left out, only the state of each coordinator is reported
+    diagnostics["weather"] = [
+        {
+            "status": coordinator.status,
+            "requests": coordinator.requests,
+            "failures": coordinator.failures,
+            "last_error": coordinator.last_error,
+            "latency": coordinator.latency.as_dict(),
+        }
+        for coordinator in hass.data.get(DATA_WEATHER, {}).values()
+    ]
+    return diagnostics
@@ -0,0 +1,86 @@
+"""
+Module StateChangeDispatcher routes state changes of the relay and night light entities
+to the covers that use them.
+
+A single dispatcher is shared by all covers of one Home Assistant instance. It only
+subscribes to the entity ids the covers registered and looks the owning covers up in a
+dictionary, so a state change costs one handler call per interested cover instead of
+one call per cover in the house.
+"""
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DATA_DISPATCHER
+
+
+class StateChangeDispatcher:
+    """Class for routing state changed events to the covers owning the entity."""
+
+    def __init__(self, hass):
+        """Initialize StateChangeDispatcher class."""
+        self.hass = hass
+        # entity_id -> handlers of the covers referencing the entity
+        self._handlers = {}
+        self._unsubscribe = None
+        self._resubscribe_pending = False
+
+    @callback
+    def async_register(self, entity_ids, handler):
+        """Register handler for entity ids, return a callable removing it again."""
+        entity_ids = {entity_id for entity_id in entity_ids if entity_id}
+        for entity_id in entity_ids:
+            self._handlers.setdefault(entity_id, []).append(handler)
+        self._schedule_resubscribe()
+
+        @callback
+        def remove():
+            for entity_id in entity_ids:
+                handlers = self._handlers.get(entity_id)
+                if handlers is None or handler not in handlers:
+                    continue
+                handlers.remove(handler)
+                if not handlers:
+                    del self._handlers[entity_id]
+            self._schedule_resubscribe()
+
+        return remove
+
+    def tracked_entity_ids(self):
+        """Return the entity ids the dispatcher is subscribed to."""
+        return set(self._handlers)
+
+    @callback
+    def _schedule_resubscribe(self):
+        # Many covers register while the platform is set up, so the subscription
+        # is renewed once per loop iteration instead of once per cover
+        if not self._resubscribe_pending:
+            self._resubscribe_pending = True
+            self.hass.loop.call_soon(self._async_resubscribe)
+
+    @callback
+    def _async_resubscribe(self):
+        self._resubscribe_pending = False
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._handlers:
+            self._unsubscribe = async_track_state_change_event(
+                self.hass, list(self._handlers), self._async_route
+            )
+
+    @callback
+    def _async_route(self, event):
+        handlers = self._handlers.get(event.data.get("entity_id"))
+        if not handlers:
+            return
+        for handler in tuple(handlers):
+            self.hass.async_create_task(handler(event))
+
+
+@callback
+def async_get_dispatcher(hass):
+    """Return the dispatcher shared by all covers, create it on first use."""
+    dispatcher = hass.data.get(DATA_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_DISPATCHER] = StateChangeDispatcher(hass)
+    return dispatcher
@@ -0,0 +1,101 @@
+"""
+Module group implements the move_group service moving many covers at once.
+
+The calculators of all covers are started first, then the relay commands of all covers
+are merged into one multi-entity service call per relay state: every relay that has to
+be switched off is switched off in one call, after that every relay that has to be
+switched on in another. A scene moving 50 blinds makes two service calls instead of a
+hundred and all covers start together. Covers whose relay group has no free motor are
+queued by the motor scheduler and started on their own later. A tilt position given
+together with a position is moved once the position is reached, as a
+set_cover_tilt_position after set_cover_position would.
+"""
+import logging
+
+from homeassistant.components.cover import ATTR_POSITION, ATTR_TILT_POSITION
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .const import DATA_COVERS
+from .relays import SERVICE_STATES, async_get_relay_cache
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_TARGETS = "targets"
+
+_POSITION = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+
+MOVE_GROUP_SCHEMA = vol.Schema(
+    {
+        # cover entity id -> position or {position, tilt_position}
+        vol.Required(ATTR_TARGETS): {
+            cv.entity_id: vol.Any(
+                _POSITION,
+                vol.Schema(
+                    {
+                        vol.Optional(ATTR_POSITION): _POSITION,
+                        vol.Optional(ATTR_TILT_POSITION): _POSITION,
+                    }
+                ),
+            )
+        }
+    }
+)
+
+
+def prepare_group_move(covers, targets):
+    """Start the calculators of the covers, return the relay entity ids per service.
+
+    The moved covers and the covers waiting for a motor are returned as well.
+    """
+    relays = {"turn_off": [], "turn_on": []}
+    moved = []
+    waiting = []
+    for entity_id, target in targets.items():
+        cover = covers.get(entity_id)
+        if cover is None:
+            _LOGGER.warning("move_group: %s is not a blinds controller cover", entity_id)
+            continue
+        if not isinstance(target, dict):
+            target = {ATTR_POSITION: target}
+
+        if not cover.try_start_motor():
+            waiting.append((cover, target))
+            continue
+        command = cover.prepare_move(target.get(ATTR_POSITION), target.get(ATTR_TILT_POSITION))
+        if command is None:
+            cover.release_idle_motor()
+            continue
+
+        moved.append(cover)
+        for service, relay in cover.needed_relay_calls(command):
+            cover.stats.relay_calls += 1
+            relays[service].append(relay)
+    return relays, moved, waiting
+
+
+async def async_handle_move_group(hass, call):
+    """Handle the move_group service call."""
+    relays, moved, waiting = prepare_group_move(hass.data.get(DATA_COVERS, {}), call.data[ATTR_TARGETS])
+    # Switch off first, so no blind ever has both relays on
+    services = ("turn_off", "turn_on")
+    for index, service in enumerate(services):
+        if not relays[service]:
+            continue
+        try:
+            await hass.services.async_call(
+                "homeassistant", service, {"entity_id": relays[service]}, False
+            )
+        except Exception:
+            # The relays of this call and of the one not sent yet did not switch
+            relay_cache = async_get_relay_cache(hass)
+            for unsent in services[index:]:
+                for relay in relays[unsent]:
+                    relay_cache.forget(relay, SERVICE_STATES[unsent])
+            for cover in moved:
+                cover.abort_command()
+            raise
+    for cover in moved:
+        cover.async_write_ha_state()
+    for cover, target in waiting:
+        await cover.async_move_to(target.get(ATTR_POSITION), target.get(ATTR_TILT_POSITION))
@@ -0,0 +1,86 @@
+"""
+Module TravelJournal keeps the travel of every cover in .storage.
+
+The restored state of an entity is only saved every 15 minutes and at shutdown, and it
+only holds the rounded positions. The journal is written shortly after every start and
+end of travel with the exact positions and the segment in progress: start position,
+target and the wall clock time the travel started. After a restart or a crash the cover
+works out where it is from the time elapsed since, instead of a calibration run.
+"""
+import asyncio
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .calculator import PositionType, TravelStatus
+from .const import DATA_JOURNAL, JOURNAL_STORAGE_KEY
+
+STORAGE_VERSION = 1
+# Changes within this delay are written together
+SAVE_DELAY = 1
+
+
+class TravelJournal:
+    """Class storing the last travel of each cover, keyed by config entry."""
+
+    def __init__(self, hass):
+        """Initialize TravelJournal class."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, JOURNAL_STORAGE_KEY)
+        self._records = {}
+        self._loading = None
+
+    async def async_load(self):
+        """Load the journal once, concurrent callers wait for the same load."""
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._async_load())
+        await self._loading
+
+    async def _async_load(self):
+        self._records = await self._store.async_load() or {}
+
+    def get(self, key):
+        """Return the record of the cover, None if there is none."""
+        return self._records.get(key)
+
+    @callback
+    def async_record(self, key, record):
+        """Replace the record of the cover, it is saved within SAVE_DELAY."""
+        self._records[key] = record
+        self._store.async_delay_save(lambda: self._records, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, key):
+        """Forget the cover."""
+        if self._records.pop(key, None) is not None:
+            self._store.async_delay_save(lambda: self._records, SAVE_DELAY)
+
+
+def travel_segment(calc, wall_now):
+    """Return the travel of the calculator in progress as a journal segment, None if stopped."""
+    if calc.position_type != PositionType.CALCULATED \
+            or calc.travel_direction == TravelStatus.STOPPED \
+            or calc.position_reached():
+        return None
+    return {
+        "start": calc.last_known_position,
+        "target": calc.travel_to_position,
+        # The clock of the calculator does not survive a restart, the wall clock does
+        "started": wall_now - (calc.current_time() - calc.travel_started_time),
+    }
+
+
+def resume_segment(calc, segment, wall_now):
+    """Restart the travel of the segment as if it had never been interrupted."""
+    calc.set_position(segment["start"])
+    calc.start_travel(segment["target"])
+    calc.travel_started_time = calc.current_time() - max(0, wall_now - segment["started"])
+
+
+@callback
+def async_get_travel_journal(hass):
+    """Return the journal shared by all covers, create it on first use."""
+    journal = hass.data.get(DATA_JOURNAL)
+    if journal is None:
+        journal = hass.data[DATA_JOURNAL] = TravelJournal(hass)
+    return journal
@@ -0,0 +1,150 @@
+"""
+Module MotorScheduler limits the number of motors running at once per relay group.
+
+Covers sharing relay modules or a power supply are put in the same motor group and
+the YAML option motor_limits caps how many of them may run at the same time. A move
+that finds its group full is queued and started as soon as a motor of the group stops,
+wind and rain protection first, then user commands, then schedules, in the order they
+came. A cover that is already running keeps its motor when it is retargeted or
+reversed. A running motor is never interrupted for a queued move. Covers without a
+limited group are never queued.
+
+    blinds_controller:
+      motor_limits:
+        ground_floor_module: 4
+"""
+import heapq
+import itertools
+
+from homeassistant.core import callback
+
+from .const import DATA_MOTOR_SCHEDULER
+from .stats import Timer
+
+PRIORITY_PROTECTION = 0
+PRIORITY_USER = 1
+PRIORITY_SCHEDULE = 2
+PRIORITY_NAMES = {PRIORITY_PROTECTION: "protection", PRIORITY_USER: "user", PRIORITY_SCHEDULE: "schedule"}
+
+
+class MotorScheduler:
+    """Class granting the motors of the relay groups to the covers."""
+
+    def __init__(self, hass):
+        """Initialize MotorScheduler class."""
+        self.hass = hass
+        # group -> maximum number of running motors, groups left out are not limited
+        self.limits = {}
+        # group -> keys of the covers running a motor
+        self._running = {}
+        # group -> heap of [priority, sequence, key, start, queued at], key -> heap entry
+        self._queues = {}
+        self._queued = {}
+        self._sequence = itertools.count()
+        # Seconds the queued moves waited for a motor, per priority
+        self.waits = {priority: Timer() for priority in PRIORITY_NAMES}
+
+    def __len__(self):
+        """Return the number of queued moves."""
+        return len(self._queued)
+
+    def running(self, group):
+        """Return the number of running motors of the group."""
+        return len(self._running.get(group, ()))
+
+    def queued(self, group):
+        """Return the number of queued moves of the group."""
+        return sum(entry[2] is not None for entry in self._queues.get(group, ()))
+
+    @callback
+    def try_start(self, key, group):
+        """Take a motor of the group for the cover if one is free, return if it has one."""
+        if group is None:
+            return True
+        running = self._running.setdefault(group, set())
+        if key in running:
+            return True
+        limit = self.limits.get(group)
+        if limit is not None and len(running) >= limit:
+            return False
+        running.add(key)
+        return True
+
+    @callback
+    def claim(self, key, group):
+        """Count a motor that already runs, e.g. switched on outside Home Assistant."""
+        self.cancel(key)
+        if group is not None:
+            self._running.setdefault(group, set()).add(key)
+
+    async def async_request(self, key, group, priority, start):
+        """Run start() now if the cover gets a motor, otherwise queue it.
+
+        A queued move of the same cover is replaced, the latest command wins.
+        """
+        self.cancel(key)
+        if self.try_start(key, group):
+            await self._async_start(key, group, start)
+            return
+        entry = [priority, next(self._sequence), key, start, self.hass.loop.time()]
+        self._queued[key] = entry
+        heapq.heappush(self._queues.setdefault(group, []), entry)
+
+    async def _async_start(self, key, group, start):
+        """Run start() of a cover granted a motor, give the motor back if it fails."""
+        try:
+            await start()
+        except BaseException:
+            # Failed or cancelled, a motor left taken would block the queue of the group
+            self.release(key, group)
+            raise
+
+    @callback
+    def cancel(self, key):
+        """Drop the queued move of the cover."""
+        entry = self._queued.pop(key, None)
+        if entry is not None:
+            # Left in the heap and skipped when it comes up
+            entry[2] = entry[3] = None
+
+    @callback
+    def release(self, key, group):
+        """Give the motor of the cover back and start the next queued moves."""
+        running = self._running.get(group)
+        if running is None or key not in running:
+            return
+        running.discard(key)
+        queue = self._queues.get(group)
+        limit = self.limits.get(group)
+        while queue and (limit is None or len(running) < limit):
+            priority, _, next_key, start, queued_at = heapq.heappop(queue)
+            if next_key is None:
+                continue
+            del self._queued[next_key]
+            running.add(next_key)
+            self.waits[priority].add(self.hass.loop.time() - queued_at)
+            self.hass.async_create_task(self._async_start(next_key, group, start))
+
+    def as_dict(self):
+        """Return the state of the groups for the diagnostics."""
+        groups = set(self.limits) | set(self._running) | set(self._queues)
+        return {
+            "groups": {
+                group: {
+                    "limit": self.limits.get(group),
+                    "running": self.running(group),
+                    "queued": self.queued(group),
+                }
+                for group in sorted(groups)
+            },
+            "wait": {PRIORITY_NAMES[priority]: timer.as_dict() for priority, timer in self.waits.items()},
+        }
+
+
+@callback
+def async_get_motor_scheduler(hass):
+    """Return the motor scheduler shared by all covers, create it on first use."""
+    scheduler = hass.data.get(DATA_MOTOR_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_MOTOR_SCHEDULER] = MotorScheduler(hass)
+    return scheduler
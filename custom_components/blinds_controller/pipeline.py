@@ -0,0 +1,61 @@
+"""
+Module CommandPipeline coalesces rapid position commands of one cover.
+
+The first command is executed right away and opens a short window. Commands arriving
+inside the window replace each other and only the latest one is executed when the
+window closes, so dragging a slider moves the blinds once to the final position
+instead of restarting the motors for every intermediate value.
+"""
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+
+class CommandPipeline:
+    """Class coalescing the commands of one cover, the latest command wins."""
+
+    def __init__(self, hass, window, execute):
+        """Initialize CommandPipeline class, execute(key, value) runs a command."""
+        self.hass = hass
+        self.window = window
+        self._execute = execute
+        # Latest pending value per command type, e.g. position and tilt position
+        self._pending = {}
+        self._unsubscribe = None
+        self.submitted = 0
+        self.merged = 0
+
+    async def async_submit(self, key, value):
+        """Execute the command now or queue it if a window is open."""
+        self.submitted += 1
+        if self.window <= 0:
+            await self._execute(key, value)
+            return
+        if self._unsubscribe is not None:
+            if key in self._pending:
+                self.merged += 1
+            self._pending[key] = value
+            return
+        self._open_window()
+        await self._execute(key, value)
+
+    @callback
+    def cancel(self):
+        """Drop the pending commands, e.g. when the cover is stopped."""
+        self.merged += len(self._pending)
+        self._pending = {}
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _open_window(self):
+        self._unsubscribe = async_call_later(self.hass, self.window, self._async_window_closed)
+
+    async def _async_window_closed(self, now):
+        self._unsubscribe = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        # Keep coalescing while commands keep coming
+        self._open_window()
+        for key, value in pending.items():
+            await self._execute(key, value)
@@ -0,0 +1,69 @@
+"""
+Module ThresholdMonitor decides when a sensor reading calls for protecting the blinds.
+
+A monitor trips as soon as a reading exceeds the threshold. It is only released after
+the readings stayed below the threshold lowered by the hysteresis for the hold time,
+so a value oscillating around the threshold keeps the protection active instead of
+letting the blinds be moved back and forth.
+"""
+
+
+def parse_reading(state):
+    """Return the numeric value of a sensor state, None while it is not available."""
+    if state is None:
+        return None
+    try:
+        return float(state.state)
+    except (TypeError, ValueError):
+        return None
+
+
+class ThresholdMonitor:
+    """Class tracking one sensor against a threshold."""
+
+    def __init__(self, threshold, hysteresis, hold_time):
+        """Initialize ThresholdMonitor class, hysteresis is in percent of the threshold."""
+        self.threshold = float(threshold)
+        self.release_below = self.threshold * (1 - float(hysteresis) / 100)
+        self.hold_time = float(hold_time)
+        self.value = None
+        self.tripped = False
+        self._calm_since = None
+
+    def update(self, value, now):
+        """Feed a new reading taken at now, return True if the monitor tripped."""
+        self.value = value
+        self.check_release(now)
+        if value > self.threshold:
+            self._calm_since = None
+            if not self.tripped:
+                self.tripped = True
+                return True
+            return False
+        if not self.tripped:
+            return False
+        if value < self.release_below:
+            if self._calm_since is None:
+                self._calm_since = now
+        else:
+            self._calm_since = None
+        return False
+
+    def exceeded(self):
+        """Return if the last reading is above the threshold."""
+        return self.value is not None and self.value > self.threshold
+
+    def release_at(self):
+        """Return the time the monitor is released if the readings stay calm."""
+        if not self.tripped or self._calm_since is None:
+            return None
+        return self._calm_since + self.hold_time
+
+    def check_release(self, now):
+        """Release the monitor once the hold time passed, return True if it was released."""
+        release_at = self.release_at()
+        if release_at is None or now < release_at:
+            return False
+        self.tripped = False
+        self._calm_since = None
+        return True
@@ -0,0 +1,48 @@
+"""
+Module MotionPublisher decides which motion updates of a cover are written as state.
+
+The motion ticker refreshes a moving cover ten times a second, while its rounded position
+changes far less often. Writing every tick fills the recorder with duplicate rows, so a
+tick is only published when the position or tilt moved by at least the configured step
+or the direction changed, and never more often than the configured rate. Direction
+changes (including the stop) bypass the rate limit, the UI always sees them at once.
+"""
+
+DEFAULT_STEP = 1
+DEFAULT_MAX_RATE = 2.0
+
+
+class MotionPublisher:
+    """Class applying the publishing policy of one cover."""
+
+    __slots__ = ("step", "min_interval", "_position", "_tilt_position", "_direction", "_published_at")
+
+    def __init__(self, step=DEFAULT_STEP, max_rate=DEFAULT_MAX_RATE):
+        """Initialize MotionPublisher class, max_rate is in writes per second."""
+        self.step = step
+        self.min_interval = 1 / max_rate if max_rate else 0
+        self._position = None
+        self._tilt_position = None
+        self._direction = None
+        self._published_at = None
+
+    def should_publish(self, snapshot, now):
+        """Return if the motion snapshot taken at now has to be written."""
+        if (snapshot.is_opening, snapshot.is_closing) != self._direction:
+            return True
+        if self._published_at is not None and now - self._published_at < self.min_interval:
+            return False
+        return self._moved(snapshot.position, self._position) \
+            or self._moved(snapshot.tilt_position, self._tilt_position)
+
+    def _moved(self, position, published):
+        if position is None or published is None:
+            return position != published
+        return abs(position - published) >= self.step
+
+    def published(self, snapshot, now):
+        """Remember the snapshot written at now, whatever triggered the write."""
+        self._position = snapshot.position
+        self._tilt_position = snapshot.tilt_position
+        self._direction = (snapshot.is_opening, snapshot.is_closing)
+        self._published_at = now
@@ -0,0 +1,142 @@
+"""
+Module RelayCache skips relay service calls that would not change anything.
+
+Every command used to switch both relays of a cover, including the one that is already
+off, so a move and its stop at the end made four service calls where two switch a
+relay. The cache remembers the state each relay was last commanded to until the relay
+reports it. A call is skipped when that command is still on its way or, with nothing
+on its way, when the state machine already shows the relay in the wanted state.
+
+Commands a relay never confirmed are reconciled periodically against the state
+machine: they are forgotten, so the next command goes out again, and a lost turn_off
+is sent once more, a motor must not keep running. The commands of calls that raised or
+were not sent are forgotten right away.
+"""
+from datetime import timedelta
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DATA_RELAY_CACHE
+
+_LOGGER = logging.getLogger(__name__)
+
+# State a relay service switches to
+SERVICE_STATES = {"turn_on": "on", "turn_off": "off"}
+
+RECONCILE_INTERVAL = timedelta(seconds=30)
+# Commands not confirmed after this long are reconciled
+CONFIRM_TIMEOUT = 10
+
+
+class RelayCache:
+    """Class keeping the commanded state of the relays until they confirm it."""
+
+    def __init__(self, hass):
+        """Initialize RelayCache class."""
+        self.hass = hass
+        # entity_id -> (commanded state, loop time it was sent, sent again by the reconciliation)
+        self._pending = {}
+        self._unsubscribe = None
+        self.sent = 0
+        self.skipped = 0
+        self.confirmed = 0
+        self.mismatches = 0
+        self.resent = 0
+        self.failed = 0
+
+    def __len__(self):
+        """Return the number of commands not confirmed yet."""
+        return len(self._pending)
+
+    @callback
+    def needed(self, entity_id, state):
+        """Return if the relay has to be switched to state ("on" or "off")."""
+        pending = self._pending.get(entity_id)
+        if pending is not None:
+            needed = pending[0] != state
+        else:
+            current = self.hass.states.get(entity_id)
+            needed = current is None or current.state != state
+        if not needed:
+            self.skipped += 1
+        return needed
+
+    @callback
+    def record(self, entity_id, state, resent=False):
+        """Remember a command sent to the relay."""
+        self.sent += 1
+        self._pending[entity_id] = (state, self.hass.loop.time(), resent)
+        if self._unsubscribe is None:
+            self._unsubscribe = async_track_time_interval(
+                self.hass, self._async_reconcile, RECONCILE_INTERVAL
+            )
+
+    @callback
+    def forget(self, entity_id, state):
+        """Drop the command recorded for a call that failed or was not sent."""
+        pending = self._pending.get(entity_id)
+        if pending is not None and pending[0] == state:
+            del self._pending[entity_id]
+            self.failed += 1
+
+    @callback
+    def async_observed(self, entity_id, old_state, new_state):
+        """Follow a state change of a relay, its state machine state is valid again."""
+        pending = self._pending.get(entity_id)
+        if pending is None or new_state is None:
+            return
+        if new_state.state == pending[0]:
+            self.confirmed += 1
+        elif old_state is not None and new_state.state == old_state.state:
+            # Only the attributes changed
+            return
+        del self._pending[entity_id]
+
+    @callback
+    def _async_reconcile(self, now):
+        deadline = self.hass.loop.time() - CONFIRM_TIMEOUT
+        for entity_id, (state, sent_at, resent) in list(self._pending.items()):
+            if sent_at > deadline:
+                continue
+            del self._pending[entity_id]
+            current = self.hass.states.get(entity_id)
+            if current is not None and current.state == state:
+                continue
+            self.mismatches += 1
+            _LOGGER.debug(
+                "%s did not confirm %s, it is %s", entity_id, state, current and current.state
+            )
+            if state == "off" and not resent and current is not None and current.state == "on":
+                self.resent += 1
+                self.record(entity_id, "off", resent=True)
+                self.hass.async_create_task(
+                    self.hass.services.async_call(
+                        "homeassistant", "turn_off", {"entity_id": entity_id}, False
+                    )
+                )
+        if not self._pending and self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def as_dict(self):
+        """Return the counters for the diagnostics."""
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "confirmed": self.confirmed,
+            "mismatches": self.mismatches,
+            "resent": self.resent,
+            "failed": self.failed,
+        }
+
+
+@callback
+def async_get_relay_cache(hass):
+    """Return the relay cache shared by all covers, create it on first use."""
+    cache = hass.data.get(DATA_RELAY_CACHE)
+    if cache is None:
+        cache = hass.data[DATA_RELAY_CACHE] = RelayCache(hass)
+    return cache
@@ -0,0 +1,187 @@
+"""
+Module ScheduleEngine fires the timed and sun based actions of all covers.
+
+Covers compile their schedule rules into functions returning the next absolute fire
+time. The engine keeps the pending fire times of every cover in one heap and runs a
+single timer for the earliest of them, so nothing wakes up until an action is due and
+an action is not lost when the event loop stalls across a minute boundary.
+
+Covers sharing a time or sunset offset would all switch their relays in the same
+instant. Every job of a cover is therefore delayed by a fixed offset derived from the
+cover id, spread evenly over a window (YAML option schedule_spread, 30 s by default).
+The offset stays the same across restarts and no cover fires later than the window.
+"""
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import logging
+import zlib
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_SCHEDULE_ENGINE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Actions firing later than this after their time are counted as missed
+MISS_TOLERANCE = timedelta(seconds=1)
+
+# Staggering is on unless schedule_spread is 0, existing schedules fire up to this much
+# later than before (see the CHANGELOG)
+DEFAULT_SPREAD = timedelta(seconds=30)
+
+
+def stagger_offset(key, spread):
+    """Return the fixed offset of the jobs of key, between 0 and spread."""
+    if not key or spread <= timedelta(0):
+        return timedelta(0)
+    return spread * (zlib.crc32(key.encode()) / 2**32)
+
+
+class ScheduledJob:
+    """A recurring action and the function computing its next fire time."""
+
+    def __init__(self, engine, next_fire, action, offset):
+        """Initialize ScheduledJob class."""
+        self.engine = engine
+        # next_fire(now) returns the next fire time after now, None to stop firing
+        self.next_fire = next_fire
+        self.action = action
+        # The job fires this long after the times returned by next_fire
+        self.offset = offset
+        self.when = None
+        self.cancelled = False
+
+    @callback
+    def cancel(self):
+        """Cancel the job, it is dropped from the heap when it comes up."""
+        self.cancelled = True
+
+
+class ScheduleEngine:
+    """Class keeping the next fire times of all scheduled jobs in a heap."""
+
+    def __init__(self, hass):
+        """Initialize ScheduleEngine class."""
+        self.hass = hass
+        self._heap = []
+        self._sequence = itertools.count()
+        self._unsubscribe = None
+        self._timer_at = None
+        self.spread = DEFAULT_SPREAD
+        self.fired = 0
+        self.misses = 0
+        self.max_lateness = timedelta(0)
+
+    def __len__(self):
+        """Return the number of pending jobs, cancelled ones included until they come up."""
+        return len(self._heap)
+
+    @callback
+    def async_add(self, next_fire, action, key=None):
+        """Add a job firing action(now) at the times returned by next_fire.
+
+        The jobs of the same key (a cover id) are staggered by the same offset.
+        """
+        job = ScheduledJob(self, next_fire, action, stagger_offset(key, self.spread))
+        self._push(job, dt_util.utcnow())
+        self._arm()
+        return job
+
+    def _push(self, job, now):
+        # A time that already passed is still due while its offset lies ahead
+        when = job.next_fire(now - job.offset)
+        if when is None:
+            return
+        when += job.offset
+        if when <= now:
+            _LOGGER.warning("Schedule returned %s which is not after %s, dropping it", when, now)
+            return
+        job.when = when
+        heapq.heappush(self._heap, (when, next(self._sequence), job))
+
+    def _arm(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._cancel_timer()
+            return
+        when = self._heap[0][0]
+        if self._timer_at is not None and self._timer_at <= when:
+            return
+        self._cancel_timer()
+        self._timer_at = when
+        self._unsubscribe = async_track_point_in_utc_time(self.hass, self._async_fire, when)
+
+    def _cancel_timer(self):
+        self._timer_at = None
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def _async_fire(self, now):
+        self._unsubscribe = None
+        self._timer_at = None
+        due = []
+        fired_at = dt_util.utcnow()
+        while self._heap and self._heap[0][0] <= now:
+            when, _, job = heapq.heappop(self._heap)
+            if not job.cancelled:
+                due.append(job)
+                self._count_fired(fired_at - when)
+        for job in due:
+            self.hass.async_create_task(job.action(now))
+            self._push(job, now)
+        self._arm()
+
+    def _count_fired(self, lateness):
+        self.fired += 1
+        if lateness > MISS_TOLERANCE:
+            self.misses += 1
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+
+@callback
+def async_get_schedule_engine(hass):
+    """Return the schedule engine shared by all covers, create it on first use."""
+    engine = hass.data.get(DATA_SCHEDULE_ENGINE)
+    if engine is None:
+        engine = hass.data[DATA_SCHEDULE_ENGINE] = ScheduleEngine(hass)
+    return engine
+
+
+def next_time_of_day(time_of_day, now, time_zone=None):
+    """Return the next occurrence of time_of_day after now, in local time by default."""
+    local_now = dt_util.as_local(now) if time_zone is None else now.astimezone(time_zone)
+    candidate = datetime.combine(local_now.date(), time_of_day, tzinfo=local_now.tzinfo)
+    if candidate <= local_now:
+        candidate = datetime.combine(
+            local_now.date() + timedelta(days=1), time_of_day, tzinfo=local_now.tzinfo
+        )
+    return dt_util.as_utc(candidate)
+
+
+def next_daily(point_in_time, now):
+    """Return point_in_time moved by whole days to be after now."""
+    if point_in_time is None:
+        return None
+    while point_in_time <= now:
+        point_in_time += timedelta(days=1)
+    return point_in_time
+
+
+def next_sun_event(current, previous, offset, now):
+    """Return the next time of a sun event shifted by offset after now.
+
+    The sun sensors move on to the next day right when the event happens, so the
+    previous value is still used while its shifted time lies ahead.
+    """
+    if current is None:
+        return None
+    if previous is not None and now < previous + offset < current + offset:
+        return previous + offset
+    return next_daily(current + offset, now)
@@ -0,0 +1,66 @@
+"""
+Diagnostic sensors exposing the runtime counters of each cover.
+
+They are disabled by default, enable them from the entity settings to find the covers
+loading the event loop. The counters themselves are always kept, the sensors only poll
+them once a minute.
+"""
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+
+from .batch import cover_configs
+from .stats import async_get_cover_stats
+
+SCAN_INTERVAL = timedelta(minutes=1)
+
+# key, name, unit, value read from the CoverStats
+SENSORS = (
+    ("ticks", "ticks", None, lambda stats: stats.ticks),
+    ("state_writes", "state writes", None, lambda stats: stats.state_writes),
+    ("relay_calls", "relay calls", None, lambda stats: stats.relay_calls),
+    ("relay_calls_skipped", "relay calls skipped", None, lambda stats: stats.relay_calls_skipped),
+    (
+        "state_changed_time", "state change handling time", UnitOfTime.MILLISECONDS,
+        lambda stats: round(stats.timers["state_changed"].total * 1000, 1),
+    ),
+    (
+        "add_ons_time", "add-ons time", UnitOfTime.MILLISECONDS,
+        lambda stats: round(stats.timers["add_ons"].total * 1000, 1),
+    ),
+    (
+        "motor_wait_time", "motor wait time", UnitOfTime.SECONDS,
+        lambda stats: round(stats.timers["motor_wait"].total, 1),
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    async_add_entities(
+        BlindsStatsSensor(device_id, cover_name, async_get_cover_stats(hass, device_id), *sensor)
+        for device_id, cover_name, _ in cover_configs(entry)
+        for sensor in SENSORS
+    )
+
+
+class BlindsStatsSensor(SensorEntity):
+    """Sensor reporting one counter of a cover."""
+
+    _attr_entity_registry_enabled_default = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, device_id, cover_name, stats, key, name, unit, value):
+        """Initialize BlindsStatsSensor class."""
+        self._stats = stats
+        self._value = value
+        self._attr_name = f"{cover_name} {name}"
+        self._attr_unique_id = f"cover_timebased_synced_uuid_{device_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def native_value(self):
+        return self._value(self._stats)
@@ -0,0 +1,156 @@
+"""
+Module stats keeps cheap runtime counters of the covers.
+
+Every cover owns a CoverStats with plain counters and timers, updated inline by the
+cover: an integer increment per tick, state write or relay call and two perf_counter
+reads around every step of the timed handlers. They are always on and read by the
+diagnostics and the optional sensors of the integration.
+
+The handler timers measure the load on the event loop: only the synchronous work of a
+handler is counted, not the time it waits for service calls, a free motor or a sleep,
+and the time of a timed handler called by another one is only counted once, in its own
+timer.
+"""
+import asyncio
+import functools
+import time
+import types
+
+from homeassistant.core import callback
+
+from .const import DATA_STATS
+
+
+class Timer:
+    """Number of calls and time spent in a handler."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self):
+        """Initialize Timer class."""
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """Record one call."""
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self):
+        """Return the timer in milliseconds."""
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class CoverStats:
+    """Counters of one cover."""
+
+    __slots__ = ("ticks", "state_writes", "relay_calls", "relay_calls_skipped", "timers")
+
+    def __init__(self):
+        """Initialize CoverStats class."""
+        self.ticks = 0
+        self.state_writes = 0
+        self.relay_calls = 0
+        self.relay_calls_skipped = 0
+        # state_changed: relay and night lights changes, add_ons: schedule, weather, Netatmo,
+        # motor_wait: time the moves waited for a free motor of the relay group
+        self.timers = {"state_changed": Timer(), "add_ons": Timer(), "motor_wait": Timer()}
+
+    def as_dict(self):
+        """Return the counters for the diagnostics."""
+        return {
+            "ticks": self.ticks,
+            "state_writes": self.state_writes,
+            "relay_calls": self.relay_calls,
+            "relay_calls_skipped": self.relay_calls_skipped,
+            **{name: timer.as_dict() for name, timer in self.timers.items()},
+        }
+
+
+# Seconds spent in timed steps nested in each running timed step, innermost last.
+# Steps run synchronously on the event loop, so they are strictly nested
+_nested = []
+
+
+def _step_started():
+    _nested.append(0.0)
+    return time.perf_counter()
+
+
+def _step_time(started):
+    """Return the seconds since started, the nested timed steps excluded."""
+    elapsed = time.perf_counter() - started
+    own = elapsed - _nested.pop()
+    if _nested:
+        _nested[-1] += elapsed
+    return own
+
+
+@types.coroutine
+def _timed_steps(coro, timer):
+    """Await coro, recording only the time of its steps between suspensions in timer."""
+    spent = 0.0
+    value = error = None
+    try:
+        while True:
+            started = _step_started()
+            try:
+                if error is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                spent += _step_time(started)
+            value = error = None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as err:
+                # Passed on to the coroutine, e.g. the cancellation of the task
+                error = err
+    finally:
+        timer.add(spent)
+
+
+def timed(name):
+    """Decorate a cover handler to record the event loop time it takes in the timer name.
+
+    Coroutines are only timed while they run, not while they wait for what they await.
+    """
+
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                return await _timed_steps(func(self, *args, **kwargs), self.stats.timers[name])
+        else:
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                started = _step_started()
+                try:
+                    return func(self, *args, **kwargs)
+                finally:
+                    self.stats.timers[name].add(_step_time(started))
+        return wrapper
+
+    return decorate
+
+
+@callback
+def async_get_cover_stats(hass, entry_id):
+    """Return the counters of the cover of the config entry, create them on first use."""
+    stats = hass.data.setdefault(DATA_STATS, {})
+    if entry_id not in stats:
+        stats[entry_id] = CoverStats()
+    return stats[entry_id]
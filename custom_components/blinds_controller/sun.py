@@ -0,0 +1,90 @@
+"""
+Module SunTimes provides the next sunrise and sunset to all covers.
+
+The sun sensors are parsed once per update into timezone aware datetimes, the covers
+subscribe for changes and apply their own offsets with timedelta arithmetic.
+The previous values are kept as well, the sensors move on to the next day right at the
+event and a schedule shifted by an offset may still be due.
+"""
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_state_change_event
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_SUN_TIMES, SUN_NEXT_DAWN_ENTITY, SUN_NEXT_DUSK_ENTITY
+
+
+def _parse_state(state):
+    """Return the datetime of a sun sensor state, None while it is unknown."""
+    if state is None:
+        return None
+    return dt_util.parse_datetime(state.state)
+
+
+class SunTimes:
+    """Class holding the parsed sun times and the covers subscribed to them."""
+
+    def __init__(self, hass):
+        """Initialize SunTimes class."""
+        self.hass = hass
+        self.sunrise = None
+        self.sunset = None
+        self.previous_sunrise = None
+        self.previous_sunset = None
+        self._listeners = []
+        self._unsubscribe = None
+
+    def is_day(self):
+        """Return if it is day, the next sunset comes before the next sunrise."""
+        return self.sunrise is not None and self.sunset is not None \
+            and self.sunset < self.sunrise
+
+    def is_night(self):
+        """Return if it is night, the next sunrise comes before the next sunset."""
+        return self.sunrise is not None and self.sunset is not None \
+            and self.sunrise < self.sunset
+
+    @callback
+    def async_subscribe(self, listener):
+        """Call listener() whenever the sun times change, return the unsubscribe callable."""
+        if self._unsubscribe is None:
+            self.sunrise = _parse_state(self.hass.states.get(SUN_NEXT_DAWN_ENTITY))
+            self.sunset = _parse_state(self.hass.states.get(SUN_NEXT_DUSK_ENTITY))
+            self._unsubscribe = async_track_state_change_event(
+                self.hass, [SUN_NEXT_DAWN_ENTITY, SUN_NEXT_DUSK_ENTITY], self._async_state_changed
+            )
+        self._listeners.append(listener)
+
+        @callback
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+
+        return remove
+
+    @callback
+    def _async_state_changed(self, event):
+        value = _parse_state(event.data.get("new_state"))
+        if value is None:
+            return
+        if event.data["entity_id"] == SUN_NEXT_DAWN_ENTITY:
+            if value == self.sunrise:
+                return
+            self.previous_sunrise, self.sunrise = self.sunrise, value
+        else:
+            if value == self.sunset:
+                return
+            self.previous_sunset, self.sunset = self.sunset, value
+        for listener in tuple(self._listeners):
+            listener()
+
+
+@callback
+def async_get_sun_times(hass):
+    """Return the sun times shared by all covers, create them on first use."""
+    sun_times = hass.data.get(DATA_SUN_TIMES)
+    if sun_times is None:
+        sun_times = hass.data[DATA_SUN_TIMES] = SunTimes(hass)
+    return sun_times
@@ -0,0 +1,79 @@
+"""
+Module MotionTicker refreshes the state of all moving covers from one shared timer.
+
+Instead of every moving cover running its own 100 ms interval, covers join the ticker
+when they start moving and leave it when they stop. One timer callback updates all of
+them in a single pass and the timer is cancelled while nothing is moving.
+
+The travel calculators of all covers live in the ticker's TravelCalculatorBank, so the
+positions of every cover are computed once per tick in one vectorized pass.
+"""
+from datetime import timedelta
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .calculator import TravelCalculatorBank
+from .const import DATA_MOTION_TICKER
+from .stats import Timer
+
+TICK_INTERVAL = timedelta(seconds=0.1)
+
+
+class MotionTicker:
+    """Class driving the periodic update of the moving covers."""
+
+    def __init__(self, hass, interval=TICK_INTERVAL):
+        """Initialize MotionTicker class."""
+        self.hass = hass
+        self.interval = interval
+        self.bank = TravelCalculatorBank()
+        # Number of ticks and time spent updating the covers
+        self.timer = Timer()
+        # Used as an ordered set, covers are updated in the order they started moving
+        self._covers = {}
+        self._unsubscribe = None
+
+    def __len__(self):
+        """Return the number of moving covers."""
+        return len(self._covers)
+
+    def __contains__(self, cover):
+        """Return if the cover is updated by the ticker."""
+        return cover in self._covers
+
+    @callback
+    def async_add(self, cover):
+        """Start updating the cover on every tick."""
+        self._covers[cover] = None
+        if self._unsubscribe is None:
+            self._unsubscribe = async_track_time_interval(
+                self.hass, self._async_tick, self.interval
+            )
+
+    @callback
+    def async_remove(self, cover):
+        """Stop updating the cover, stop the timer if nothing moves anymore."""
+        self._covers.pop(cover, None)
+        if not self._covers and self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def _async_tick(self, now):
+        started = time.perf_counter()
+        self.bank.compute()
+        # Covers reaching their position remove themselves while we iterate
+        for cover in tuple(self._covers):
+            cover.auto_updater_hook(now)
+        self.timer.add(time.perf_counter() - started)
+
+
+@callback
+def async_get_motion_ticker(hass):
+    """Return the ticker shared by all covers, create it on first use."""
+    ticker = hass.data.get(DATA_MOTION_TICKER)
+    if ticker is None:
+        ticker = hass.data[DATA_MOTION_TICKER] = MotionTicker(hass)
+    return ticker
@@ -0,0 +1,226 @@
+"""
+Module WeatherCoordinator fetches the Open-Meteo forecast once for all covers.
+
+One coordinator exists per location. It polls the API on a fixed interval with the
+shared aiohttp session of Home Assistant, caches the parsed result for the interval
+and pushes it to the subscribed covers. Requests started while one is in flight share
+its result, so any number of covers cause one request per interval.
+
+Requests are bounded by a timeout. Failed requests are retried with exponential
+backoff and after a few failures in a row the circuit opens: the status turns
+unavailable and no request is made until the backoff delay passed. Meanwhile the last
+good reading is used until it expires.
+"""
+import asyncio
+from datetime import timedelta
+import logging
+import time
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import DATA_WEATHER, DATA_WEATHER_URL
+from .stats import Timer
+
+_LOGGER = logging.getLogger(__name__)
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+WEATHER_INTERVAL = timedelta(minutes=30)
+REQUEST_TIMEOUT = timedelta(seconds=10)
+# Retry delays double from the first to the last value
+BACKOFF_MIN = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(minutes=30)
+# Failures in a row opening the circuit
+FAILURE_THRESHOLD = 3
+# The last good reading is used for protection decisions until it is this old
+READING_MAX_AGE = timedelta(hours=2)
+
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_UNAVAILABLE = "unavailable"
+
+
+class WeatherData:
+    """Parsed weather reading."""
+
+    def __init__(self, wind_speed, weather_code, fetched_at):
+        """Initialize WeatherData class."""
+        self.wind_speed = wind_speed
+        self.weather_code = weather_code
+        self.fetched_at = fetched_at
+
+    @classmethod
+    def from_json(cls, data, fetched_at):
+        """Return the reading parsed from the API response."""
+        wind_speed = data.get("current", {}).get("wind_speed_10m")
+        weather_codes = data.get("daily", {}).get("weather_code") or [None]
+        return cls(wind_speed, weather_codes[0], fetched_at)
+
+
+class WeatherCoordinator:
+    """Class fetching the weather of one location for all subscribed covers."""
+
+    def __init__(self, hass, latitude, longitude, base_url=OPEN_METEO_URL,
+                 interval=WEATHER_INTERVAL, session=None, timeout=REQUEST_TIMEOUT,
+                 backoff_min=BACKOFF_MIN, backoff_max=BACKOFF_MAX,
+                 max_age=READING_MAX_AGE):
+        """Initialize WeatherCoordinator class."""
+        self.hass = hass
+        self.base_url = base_url
+        self.params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": "wind_speed_10m",
+            "daily": "weather_code",
+        }
+        self.interval = interval
+        self.timeout = aiohttp.ClientTimeout(total=timeout.total_seconds())
+        self.backoff_min = backoff_min.total_seconds()
+        self.backoff_max = backoff_max.total_seconds()
+        self.max_age = max_age.total_seconds()
+        self.data = None
+        self.requests = 0
+        self.failures = 0
+        self.last_error = None
+        # Duration of the requests, failed ones included
+        self.latency = Timer()
+        self._retry_at = None
+        self._unsubscribe_retry = None
+        self._session = session
+        self._listeners = []
+        self._unsubscribe = None
+        self._pending = None
+
+    @callback
+    def async_subscribe(self, listener):
+        """Call listener(data) for every new reading, return the unsubscribe callable."""
+        self._listeners.append(listener)
+        if self._unsubscribe is None:
+            self._unsubscribe = async_track_time_interval(
+                self.hass, self._async_interval, self.interval
+            )
+            self.hass.async_create_task(self.async_refresh())
+        elif self.usable_data() is not None:
+            listener(self.data)
+
+        @callback
+        def remove():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+                self._cancel_retry()
+
+        return remove
+
+    @property
+    def status(self):
+        """Return ok, degraded after failed requests or unavailable while the circuit is open."""
+        if self.failures >= FAILURE_THRESHOLD:
+            return STATUS_UNAVAILABLE
+        if self.failures:
+            return STATUS_DEGRADED
+        return STATUS_OK
+
+    def usable_data(self):
+        """Return the last good reading, None once it expired."""
+        if self.data is None or time.monotonic() - self.data.fetched_at > self.max_age:
+            return None
+        return self.data
+
+    async def _async_interval(self, now):
+        await self.async_refresh(force=True)
+
+    async def async_refresh(self, force=False):
+        """Return the current reading, fetch it if the cached one expired."""
+        if not force and self.data is not None \
+                and time.monotonic() - self.data.fetched_at < self.interval.total_seconds():
+            return self.data
+        # The circuit is open until the backoff delay passed
+        if self._retry_at is not None and time.monotonic() < self._retry_at:
+            return self.usable_data()
+        # Callers arriving while a request is in flight wait for its result
+        if self._pending is None:
+            self._pending = self.hass.loop.create_task(self._async_fetch())
+        try:
+            return await asyncio.shield(self._pending)
+        finally:
+            if self._pending is not None and self._pending.done():
+                self._pending = None
+
+    async def _async_fetch(self):
+        if self._session is None:
+            self._session = async_get_clientsession(self.hass)
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            try:
+                async with self._session.get(
+                    self.base_url, params=self.params, timeout=self.timeout
+                ) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+            finally:
+                self.latency.add(time.monotonic() - started)
+            reading = WeatherData.from_json(data, time.monotonic())
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, TypeError) as e:
+            self._async_failed(e)
+            return self._async_notify(self.usable_data())
+        self.failures = 0
+        self.last_error = None
+        self._retry_at = None
+        self._cancel_retry()
+        self.data = reading
+        _LOGGER.debug(
+            "Wind speed: %s, Weather code: %s", self.data.wind_speed, self.data.weather_code
+        )
+        return self._async_notify(self.data)
+
+    @callback
+    def _async_failed(self, error):
+        self.failures += 1
+        self.last_error = repr(error)
+        delay = min(self.backoff_min * 2 ** (self.failures - 1), self.backoff_max)
+        self._retry_at = time.monotonic() + delay
+        if self.failures == FAILURE_THRESHOLD:
+            _LOGGER.error("Weather data unavailable, retrying in %s s: %s", delay, error)
+        else:
+            _LOGGER.warning("Error retrieving weather data, retrying in %s s: %s", delay, error)
+        # Retry before the next interval unless the backoff already reaches it
+        self._cancel_retry()
+        if self._listeners and delay < self.interval.total_seconds():
+            self._unsubscribe_retry = async_call_later(self.hass, delay, self._async_retry)
+
+    async def _async_retry(self, now):
+        self._unsubscribe_retry = None
+        self._retry_at = None
+        await self.async_refresh(force=True)
+
+    def _cancel_retry(self):
+        if self._unsubscribe_retry is not None:
+            self._unsubscribe_retry()
+            self._unsubscribe_retry = None
+
+    @callback
+    def _async_notify(self, data):
+        if data is not None:
+            for listener in tuple(self._listeners):
+                listener(data)
+        return data
+
+
+@callback
+def async_get_weather_coordinator(hass, latitude, longitude):
+    """Return the coordinator of the location, create it on first use."""
+    coordinators = hass.data.setdefault(DATA_WEATHER, {})
+    key = (latitude, longitude)
+    coordinator = coordinators.get(key)
+    if coordinator is None:
+        base_url = hass.data.get(DATA_WEATHER_URL, OPEN_METEO_URL)
+        coordinator = coordinators[key] = WeatherCoordinator(
+            hass, latitude, longitude, base_url
+        )
+    return coordinator